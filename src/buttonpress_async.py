@@ -15,6 +15,7 @@ class button_async():
         self._pressed = False
         self._was_pressed = False
         self._press_duration_ms = 0
+        self._press_reported_ms = 0
         loop = asyncio.get_event_loop()
         loop.create_task(self.run())
 
@@ -43,6 +44,7 @@ class button_async():
 
             await asyncio.sleep_ms(DEBOUNCE)
 
+            self._press_reported_ms = time.ticks_ms()
             self._was_pressed = True
 
     def was_pressed(self):
@@ -55,6 +57,9 @@ class button_async():
             return True
         return False
 
+    def ms_since_press(self):
+        return time.ticks_diff(time.ticks_ms(), self._press_reported_ms)
+
     def reset_press(self):
         self._was_pressed = False
         self._press_duration_ms = 0
@@ -0,0 +1,95 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# kept free of MicroPython specific imports so that config.json can also be
+# validated on the host when building the compiled config module
+
+_boolean_entries = ("use_display", "use_led", "use_buzzer", "setup_network", "enable_webrepl", "show_progress_ticks", "low_contrast_mode", "blank_oled_on_standby")
+_integer_entries = ("contrast", "status_poll_interval_seconds", "standby_status_poll_interval_minutes", "idle_standby_minutes", "long_press_duration_milliseconds", "api_request_dot_size", "buzzer_frequency", "buzzer_duty")
+_dict_entries = ("spotify", "pins", "wlan")
+_spotify_entries = ("client_id", "client_secret")
+_pin_entries = ("led", "scl", "sda", "button_playpause", "button_next", "buzzer")
+_wlan_entries = ("ssid", "password", "mdns")
+_display_buses = ("soft_i2c", "i2c", "spi")
+_spi_pin_entries = ("dc", "res", "cs")
+_log_levels = ("debug", "info", "warning", "error")
+
+# optional entries and the values used when they are left out
+_defaults = (("display_bus", "soft_i2c"), ("use_gzip", False), ("log_level", "info"), ("metrics_port", 0), ("display_max_fps", 10), ("api_trace_kb", 0), ("playback_cache_ttl_ms", 30000),
+             ("standby_hw_scroll", True))
+
+class Config:
+    # the entries of config.json as attributes, the same way the compiled
+    # config module provides them
+    def __init__(self, config):
+        for key in config:
+            setattr(self, key, config[key])
+
+def with_defaults(config):
+    for key, value in _defaults:
+        if key not in config:
+            config[key] = value
+    return config
+
+def validate(config):
+    for b in _boolean_entries:
+        if b not in config or type(config[b]) is not bool:
+            return "\"{}\" not configured or not boolean".format(b)
+
+    for i in _integer_entries:
+        if i not in config or type(config[i]) is not int:
+            return "\"{}\" not configured or not integer".format(i)
+
+    for d in _dict_entries:
+        if d not in config or type(config[d]) is not dict:
+            return "\"{}\" not configured or not dict".format(d)
+
+    for s in _spotify_entries:
+        if s not in config['spotify'] or config['spotify'][s] is None or len(config['spotify'][s]) < 16:
+            return "\"{}\" not configured or is invalid".format(s)
+
+    for p in _pin_entries:
+        if p not in config['pins'] or type(config['pins'][p]) is not int:
+            return "\"{}\" not configured or is invalid".format(p)
+
+    for w in _wlan_entries:
+        if w not in config['wlan'] or config['wlan'][w] is None or len(config['wlan'][w]) < 1:
+            return "\"{}\" not configured or is invalid".format(w)
+
+    if 'use_gzip' in config and type(config['use_gzip']) is not bool:
+        return "\"use_gzip\" not boolean"
+
+    if 'standby_hw_scroll' in config and type(config['standby_hw_scroll']) is not bool:
+        return "\"standby_hw_scroll\" not boolean"
+
+    if 'metrics_port' in config:
+        if type(config['metrics_port']) is not int:
+            return "\"metrics_port\" not integer"
+        # port 80 is taken by the login server during authorization
+        if config['metrics_port'] == 80 or not 0 <= config['metrics_port'] < 65536:
+            return "\"metrics_port\" needs to be 0 (disabled) or a port other than 80"
+
+    if 'api_trace_kb' in config and (type(config['api_trace_kb']) is not int or config['api_trace_kb'] < 0):
+        return "\"api_trace_kb\" needs to be 0 (disabled) or a positive integer"
+
+    if 'playback_cache_ttl_ms' in config and (type(config['playback_cache_ttl_ms']) is not int or config['playback_cache_ttl_ms'] < 0):
+        return "\"playback_cache_ttl_ms\" needs to be 0 or a positive integer"
+
+    if 'display_max_fps' in config:
+        if type(config['display_max_fps']) is not int or not 0 <= config['display_max_fps'] <= 1000:
+            return "\"display_max_fps\" needs to be an integer from 0 (unlimited) to 1000"
+
+    if config.get('log_level', "info") not in _log_levels:
+        return "\"log_level\" needs to be one of: {}".format(", ".join(_log_levels))
+
+    display_bus = config.get('display_bus', "soft_i2c")
+    if display_bus not in _display_buses:
+        return "\"display_bus\" needs to be one of: {}".format(", ".join(_display_buses))
+
+    if display_bus == "spi":
+        for p in _spi_pin_entries:
+            if p not in config['pins'] or type(config['pins'][p]) is not int:
+                return "\"{}\" not configured or is invalid".format(p)
+
+    return None
@@ -0,0 +1,68 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Leveled logging with lazily formatted arguments. Messages below both the
+# print level and the buffer level are not formatted, messages at or above
+# the buffer level are kept formatted in a fixed-size ring buffer for dump()
+# so that the buffer holds no references to the objects that were logged.
+
+import time
+from micropython import const
+
+DEBUG = const(10)
+INFO = const(20)
+WARNING = const(30)
+ERROR = const(40)
+
+_ring_size = const(32)
+_level_names = {DEBUG: "D", INFO: "I", WARNING: "W", ERROR: "E"}
+_levels = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+
+_state = {'print_level': INFO, 'buffer_level': DEBUG, 'index': 0}
+_ring = [None] * _ring_size
+
+def level_from_name(name):
+    return _levels.get(name)
+
+def set_level(level):
+    _state['print_level'] = level
+
+def redact(secret):
+    if secret is None:
+        return None
+    return "{}...".format(secret[:4])
+
+def _log(level, msg, args):
+    if level < _state['buffer_level'] and level < _state['print_level']:
+        return
+
+    if len(args) == 0:
+        line = "{} {} {}".format(time.ticks_ms(), _level_names[level], msg)
+    else:
+        line = "{} {} {}".format(time.ticks_ms(), _level_names[level], msg.format(*args))
+
+    if level >= _state['buffer_level']:
+        _ring[_state['index']] = line
+        _state['index'] = (_state['index'] + 1) % _ring_size
+
+    if level >= _state['print_level']:
+        print(line)
+
+def debug(msg, *args):
+    _log(DEBUG, msg, args)
+
+def info(msg, *args):
+    _log(INFO, msg, args)
+
+def warning(msg, *args):
+    _log(WARNING, msg, args)
+
+def error(msg, *args):
+    _log(ERROR, msg, args)
+
+def dump():
+    for i in range(_ring_size):
+        line = _ring[(_state['index'] + i) % _ring_size]
+        if line is not None:
+            print(line)
@@ -0,0 +1,116 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+import gc
+import time
+import uasyncio as asyncio
+from micropython import const
+
+# imports from additional files
+import log
+
+# the heap info of ESP-IDF, where TLS and network buffers are allocated from,
+# is available only on the esp32 port
+try:
+    import esp32
+except ImportError:
+    esp32 = None
+
+_client_timeout_seconds = const(5)
+_prefix = const("spostatus_")
+
+_state = {'enabled': False, 'started': 0}
+_counters = {}
+_summaries = {}
+
+def enabled():
+    return _state['enabled']
+
+def _key(name, labels):
+    if labels is None:
+        return (name, "")
+    return (name, "{" + ",".join(["{}=\"{}\"".format(k, v) for k, v in labels]) + "}")
+
+def inc(name, labels = None, value = 1):
+    if not _state['enabled']:
+        return
+    key = _key(name, labels)
+    _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, labels = None):
+    if not _state['enabled']:
+        return
+    key = _key(name, labels)
+    summary = _summaries.get(key)
+    if summary is None:
+        _summaries[key] = [1, value]
+    else:
+        summary[0] += 1
+        summary[1] += value
+
+def _write_gauge(writer, name, value):
+    writer.write("# TYPE {0}{1} gauge\n{0}{1} {2}\n".format(_prefix, name, value).encode())
+
+def _write_metrics(writer):
+    writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\nConnection: close\r\n\r\n")
+    _write_gauge(writer, "uptime_seconds", time.time() - _state['started'])
+    _write_gauge(writer, "heap_free_bytes", gc.mem_free())
+    _write_gauge(writer, "heap_allocated_bytes", gc.mem_alloc())
+    if esp32 is not None:
+        heaps = esp32.idf_heap_info(esp32.HEAP_DATA)
+        _write_gauge(writer, "idf_heap_free_bytes", sum([h[1] for h in heaps]))
+        _write_gauge(writer, "idf_heap_largest_free_block_bytes", max([h[2] for h in heaps]))
+
+    # sorted so that all label combinations of a metric follow its type line
+    name = None
+    for key in sorted(_counters):
+        if key[0] != name:
+            name = key[0]
+            writer.write("# TYPE {}{} counter\n".format(_prefix, name).encode())
+        writer.write("{}{}{} {}\n".format(_prefix, key[0], key[1], _counters[key]).encode())
+    name = None
+    for key in sorted(_summaries):
+        summary = _summaries[key]
+        if key[0] != name:
+            name = key[0]
+            writer.write("# TYPE {}{} summary\n".format(_prefix, name).encode())
+        writer.write("{}{}_count{} {}\n".format(_prefix, key[0], key[1], summary[0]).encode())
+        writer.write("{}{}_sum{} {}\n".format(_prefix, key[0], key[1], summary[1]).encode())
+
+async def _read_request_path(reader):
+    reqpath = None
+    while True:
+        line = await reader.readline()
+        if not line or line == b'\r\n':
+            break
+        if line.startswith(b'GET '):
+            reqpath = line.split(b" ")[1]
+    return reqpath
+
+async def _handle_client(reader, writer):
+    try:
+        # one deadline for the whole request so that a client trickling header lines can't keep the connection open
+        reqpath = await asyncio.wait_for(_read_request_path(reader), _client_timeout_seconds)
+
+        if reqpath == b'/metrics':
+            _write_metrics(writer)
+        else:
+            writer.write(b"HTTP/1.0 404 Not Found\r\nContent-Type: text/plain\r\nConnection: close\r\n\r\nNot Found\r\n")
+        await asyncio.wait_for(writer.drain(), _client_timeout_seconds)
+    except asyncio.TimeoutError:
+        pass
+    except OSError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+async def start(port):
+    _state['enabled'] = True
+    _state['started'] = time.time()
+    await asyncio.start_server(_handle_client, '0.0.0.0', port, backlog = 2)
+    log.info("metrics available at port {} /metrics", port)
@@ -2,26 +2,56 @@
 # Copyright (c) 2020 Teemu Toivola
 # https://github.com/vergoh/micropython-spotify-status-display
 
-from machine import Pin, SoftI2C
+import time
+import framebuf
+from machine import Pin, SoftI2C, I2C, SPI
+import metrics
 import ssd1306
 import textutils
 
 class OLED:
 
-    def __init__(self, scl_pin = 22, sda_pin = 21, contrast = 127, enable = True):
+    def __init__(self, scl_pin = 22, sda_pin = 21, contrast = 127, enable = True, bus = "soft_i2c", dc_pin = None, res_pin = None, cs_pin = None,
+                 max_fps = 0, standby_hw_scroll = True):
         self.oled_width = 128
         self.oled_height = 64
+        self.standby_hw_scroll = standby_hw_scroll
         self.standby_x = 0
         self.standby_y = 0
+        self.hw_scrolling = False
+        self.blanked = False
         self.status_dot = False
         self.status_dot_size = 1
+        self.layout_artist = None
+        self.layout_title = None
+        self.layout = None
+        self.frame_lines = None
+        self.frame_barwidth = None
+        self.frame_ticks = None
+        self.frame_separator = None
+        self.frame_status_dot = None
+        self.frame_status_dot_size = None
+        self.corner = None
+        self.corner_size = 0
+        self.corner_dot_shown = False
+        # 0 leaves the frame rate unlimited
+        self.frame_interval_ms = 1000 // max_fps if max_fps > 0 else 0
+        self.transfer_ticks = None
 
         if enable is False:
             self.enabled = False
             return
 
-        self.i2c = SoftI2C(scl = Pin(scl_pin), sda = Pin(sda_pin))
-        self.oled = ssd1306.SSD1306_I2C(self.oled_width, self.oled_height, self.i2c)
+        if bus == "spi":
+            # scl and sda pins are used as SCK (D0) and MOSI (D1) in spi mode
+            self.spi = SPI(1, baudrate = 10 * 1024 * 1024, sck = Pin(scl_pin), mosi = Pin(sda_pin))
+            self.oled = ssd1306.SSD1306_SPI(self.oled_width, self.oled_height, self.spi, Pin(dc_pin), Pin(res_pin), Pin(cs_pin))
+        else:
+            if bus == "i2c":
+                self.i2c = I2C(0, scl = Pin(scl_pin), sda = Pin(sda_pin), freq = 400000)
+            else:
+                self.i2c = SoftI2C(scl = Pin(scl_pin), sda = Pin(sda_pin))
+            self.oled = ssd1306.SSD1306_I2C(self.oled_width, self.oled_height, self.i2c)
         self.oled.fill(0)
         self.oled.contrast(contrast)
         self.oled.text("      ...      ", 4, 30)
@@ -57,24 +87,106 @@ class OLED:
 
         return ''.join(result)
 
-    def show(self, artist, title, progress = None, ticks = True, separator = True):
+    def show(self, artist, title, progress = None, ticks = True, separator = True, progress_max = 100):
         if not self.enabled:
             if progress is not None:
-                print("Display: {} - {} ({}%)".format(artist.strip(), title.strip(), progress))
+                print("Display: {} - {} ({}%)".format(artist.strip(), title.strip(), progress * 100 // progress_max))
             else:
                 print("Display: {} - {}".format(artist.strip(), title.strip()))
             return
 
+        lines, line_y = self._layout(artist, title)
+
+        barwidth = None
+        if progress is not None:
+            if progress < 0:
+                progress = 0
+            if progress > progress_max:
+                progress = progress_max
+
+            # rounded to the nearest pixel, integer progress (such as milliseconds)
+            # keeps this free of float allocations
+            barwidth = int((progress * self.oled_width + progress_max // 2) // progress_max)
+
+        # skip drawing and transferring a frame identical to the one already on screen,
+        # the progress bar for example moves only every few seconds during playback,
+        # compared field by field as collecting the fields in a tuple would allocate
+        if (lines == self.frame_lines and barwidth == self.frame_barwidth and ticks == self.frame_ticks and separator == self.frame_separator
+                and self.status_dot == self.frame_status_dot and self.status_dot_size == self.frame_status_dot_size):
+            return
+        self.frame_lines = lines
+        self.frame_barwidth = barwidth
+        self.frame_ticks = ticks
+        self.frame_separator = separator
+        self.frame_status_dot = self.status_dot
+        self.frame_status_dot_size = self.status_dot_size
+        render_start = time.ticks_ms() if metrics.enabled() else 0
+
         self.oled.fill(0)
 
         if self.status_dot:
-            for x in range(self.status_dot_size):
-                for y in range(self.status_dot_size):
-                    self.oled.pixel(x, y, 1)
+            self.oled.fill_rect(0, 0, self.status_dot_size, self.status_dot_size, 1)
+
+        # index loops instead of iterators keep this allocation free also on the host
+        # where tools/check_alloc.py measures it
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            self.oled.text(line[0], line[1], line[2])
+            i += 1
+
+        if barwidth is not None:
+            if ticks:
+                i = 0
+                while i < self.oled_width:
+                    self.oled.vline(i, line_y, 2, 1)
+                    i += 32
+                self.oled.vline(self.oled_width - 1, line_y, 2, 1)
+
+            self.oled.fill_rect(0, line_y, barwidth, 2, 1)
+        else:
+            if separator:
+                self.oled.fill_rect(31, line_y, 64, 2, 1)
+
+        self._transfer()
+        if metrics.enabled():
+            metrics.observe("display_render_ms", time.ticks_diff(time.ticks_ms(), render_start))
+
+    def _transfer(self):
+        # at most max_fps frames per second, a frame coming sooner than that after
+        # the previous one waits for the rest of the interval instead of being dropped
+        # as it may be a status message that stays on screen during a request
+        if self.frame_interval_ms > 0:
+            if self.transfer_ticks is not None:
+                wait_ms = self.frame_interval_ms - time.ticks_diff(time.ticks_ms(), self.transfer_ticks)
+                if wait_ms > 0:
+                    time.sleep_ms(wait_ms)
+                    if metrics.enabled():
+                        metrics.inc("display_frames_delayed_total")
+            self.transfer_ticks = time.ticks_ms()
+        if self.hw_scrolling:
+            self.oled.hw_scroll_stop()
+            self.hw_scrolling = False
+        self.oled.show()
+        self.corner_dot_shown = False
+        if self.blanked:
+            self.oled.display(1)
+            self.blanked = False
+        if metrics.enabled():
+            metrics.inc("display_frames_total")
+            metrics.inc("display_bytes_total", value = len(self.oled.buffer))
+
+    def _layout(self, artist, title):
+        # the same artist and title get shown every second during playback,
+        # reuse the previous layout instead of wrapping the text again
+        if artist == self.layout_artist and title == self.layout_title:
+            return self.layout
 
         y = 0
-        a = textutils.wrap(self._replace_chars(artist.strip()), width = int(self.oled_width / 8), center = True)
-        t = textutils.wrap(self._replace_chars(title.strip()), width = int(self.oled_width / 8), center = True)
+        # at most six lines of text fit on the display, let artist take up to three of them
+        a = textutils.wrap(self._replace_chars(artist.strip()), width = self.oled_width // 8, center = True, max_lines = 3)
+        t = textutils.wrap(self._replace_chars(title.strip()), width = self.oled_width // 8, center = True, max_lines = 6 - len(a))
+        lines = []
 
         if len(a) == 1 and len(a) + len(t) <= 4:
             y = 10
@@ -83,7 +195,7 @@ class OLED:
             x = 0
             if len(a_line.strip()) % 2 == 1:
                 x = 4
-            self.oled.text(a_line, x, y)
+            lines.append((a_line, x, y))
             y = y + 10
 
         if len(a) + len(t) <= 5:
@@ -92,48 +204,47 @@ class OLED:
             spacing = 4
 
         y = y + spacing
-
-        if progress is not None:
-            if ticks:
-                for i in range(self.oled_width):
-                    if i % 32 == 0:
-                        self.oled.pixel(i, y - int(spacing / 2) - 2, 1)
-                        self.oled.pixel(i, y - int(spacing / 2) - 1, 1)
-                self.oled.pixel(self.oled_width - 1, y - int(spacing / 2) - 2, 1)
-                self.oled.pixel(self.oled_width - 1, y - int(spacing / 2) - 1, 1)
-
-            if progress < 0:
-                progress = 0
-            if progress > 100:
-                progress = 100
-
-            barwidth = int(round(progress / 100 * self.oled_width, 0))
-
-            for i in range(barwidth):
-                self.oled.pixel(i, y - int(spacing / 2) - 2, 1)
-                self.oled.pixel(i, y - int(spacing / 2) - 1, 1)
-        else:
-            if separator:
-                for i in range(31, 95):
-                    self.oled.pixel(i, y - int(spacing / 2) - 2, 1)
-                    self.oled.pixel(i, y - int(spacing / 2) - 1, 1)
+        line_y = y - spacing // 2 - 2
 
         for t_line in t:
             x = 0
             if len(t_line.strip()) % 2 == 1:
                 x = 4
-            self.oled.text(t_line, x, y)
+            lines.append((t_line, x, y))
             y = y + 10
 
-        self.oled.show()
+        self.layout_artist = artist
+        self.layout_title = title
+        self.layout = (lines, line_y)
+
+        return self.layout
 
     def standby(self):
         if not self.enabled:
             return
 
+        # the display moves the pixel around on its own once scrolling has been started,
+        # nothing gets transferred until something else is shown
+        if self.hw_scrolling:
+            return
+
+        self.frame_lines = None
+
+        if self.standby_hw_scroll:
+            self.oled.fill(0)
+            self.oled.pixel(0, 0, 1)
+            self._transfer()
+
+            self.oled.hw_scroll_diagonal(frames = 256, vertical_offset = 1)
+            self.hw_scrolling = True
+            return
+
+        # the scroll commands of the SSD1306 aren't compatible with all panels, such as
+        # SSD1309 ones, so the pixel can instead be moved along the edges with a full
+        # frame on each call
         self.oled.fill(0)
         self.oled.pixel(self.standby_x, self.standby_y, 1)
-        self.oled.show()
+        self._transfer()
 
         if self.standby_y == 0 and self.standby_x < self.oled_width - 1:
             self.standby_x += 1
@@ -144,15 +255,46 @@ class OLED:
         elif self.standby_x == 0 and self.standby_y > 0:
             self.standby_y -= 1
 
-    def _corner_dot(self, fill, size = 1):
+    def blank(self):
         if not self.enabled:
             return
 
-        for x in range(self.oled_width - size, self.oled_width):
-            for y in range(size):
-                self.oled.pixel(x, y, fill)
+        # turning the display off keeps the ram content, the next transfer turns it back on
+        self.frame_lines = None
+        self.corner_dot_shown = False
+        self.oled.fill(0)
+        self.oled.display(0)
+        self.blanked = True
 
-        self.oled.show()
+    def _corner_dot(self, fill, size = 1):
+        if not self.enabled:
+            return
+
+        if fill:
+            if self.corner_dot_shown:
+                return
+            # keep what the dot covers so that hiding it restores the frame as it was
+            # and show() can keep skipping the identical frame afterwards
+            if size != self.corner_size:
+                self.corner = framebuf.FrameBuffer(bytearray((size + 7) // 8 * size), size, size, framebuf.MONO_VLSB)
+                self.corner_size = size
+            self.corner.blit(self.oled.framebuf, size - self.oled_width, 0)
+            self.oled.fill_rect(self.oled_width - size, 0, size, size, 1)
+        else:
+            # a full frame has already replaced the dot
+            if not self.corner_dot_shown:
+                return
+            size = self.corner_size
+            self.oled.framebuf.blit(self.corner, self.oled_width - size, 0)
+
+        # the display ram needs to be written in full after scrolling and blanking
+        if self.hw_scrolling or self.blanked:
+            self._transfer()
+        else:
+            self.oled.show_area(self.oled_width - size, self.oled_width - 1, 0, (size - 1) // 8)
+            if metrics.enabled():
+                metrics.inc("display_bytes_total", value = (size + 7) // 8 * size)
+        self.corner_dot_shown = fill == 1
 
     def show_corner_dot(self, size = 1):
         self._corner_dot(1, size = size)
@@ -171,5 +313,7 @@ class OLED:
         if not self.enabled:
             return
 
+        self.frame_lines = None
+
         self.oled.fill(0)
-        self.oled.show()
+        self._transfer()
@@ -0,0 +1,58 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+import time
+
+class PlaybackState:
+    __slots__ = ('track_id', 'type', 'artist', 'title', 'duration_ms', 'progress_ms', 'progress_ticks_ms', 'device_id', 'fetched_ticks_ms')
+
+    def __init__(self, player_status, fetched_ticks_ms = None):
+        if fetched_ticks_ms is None:
+            fetched_ticks_ms = time.ticks_ms()
+
+        item = player_status.get('item') or {}
+
+        self.type = player_status.get('currently_playing_type', '')
+        self.track_id = item.get('id')
+
+        if self.type == 'track':
+            self.artist = (item.get('artists') or [{}])[0].get('name', 'Unknown Artist')
+            self.title = item.get('name', 'Unknown Track')
+        elif self.type == 'episode':
+            self.artist = (item.get('show') or {}).get('name', 'Unknown Podcast')
+            self.title = item.get('name', 'Unknown Episode')
+        else:
+            self.artist = "Unknown content"
+            self.title = ""
+
+        self.duration_ms = item.get('duration_ms')
+        self.progress_ms = player_status.get('progress_ms')
+        # progress_ms was valid at the time the reply was received
+        self.progress_ticks_ms = fetched_ticks_ms
+        self.fetched_ticks_ms = fetched_ticks_ms
+
+        self.device_id = None
+        device = player_status.get('device') or {}
+        if device.get('id') is not None and len(device['id']) > 8:
+            self.device_id = device['id']
+
+    def has_progress(self):
+        return self.progress_ms is not None and self.duration_ms is not None and self.duration_ms > 0
+
+    def progress_now_ms(self):
+        return self.progress_ms + time.ticks_diff(time.ticks_ms(), self.progress_ticks_ms)
+
+    def age_ms(self):
+        return time.ticks_diff(time.ticks_ms(), self.fetched_ticks_ms)
+
+    def pack(self):
+        progress_ms = self.progress_now_ms() if self.progress_ms is not None else None
+        return [self.track_id, self.type, self.artist, self.title, self.duration_ms, progress_ms, self.device_id]
+
+def unpack(packed, elapsed_ms = 0):
+    state = PlaybackState({})
+    state.track_id, state.type, state.artist, state.title, state.duration_ms, state.progress_ms, state.device_id = packed
+    if state.progress_ms is not None:
+        state.progress_ms += elapsed_ms
+    return state
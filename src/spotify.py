@@ -11,62 +11,86 @@ from machine import Pin
 from micropython import const, mem_info
 
 # imports from additional files
+import log
 import oled
+import metrics
+import playback
 import spotify_api
+import warmstate
 from buttonpress_async import button_async
 from buzzer import buzzer
 
 _app_name = const("Spotify status")
+_save_queue_file = const("save_queue.txt")
+_save_queue_batch_size = const(50)
+_save_queue_retry_seconds = const(60)
+_standby_pixel_interval_seconds = const(10)
+_pause_latency_initial_ms = const(1000)
+# how far into the next track a paused reply can be and still be the late pause after current
+_pause_late_slack_ms = const(1000)
 
 class Spotify:
 
     def __init__(self):
         self.device_id = None
+        self.playback = None
         self.pause_after_current = False
+        self.pause_latency_ms = _pause_latency_initial_ms
+        self.pause_latency_dev_ms = 0
+        self.pause_check_track_id = None
+        self.pause_check_duration_ms = 0
+        self.pause_check_end_ticks_ms = 0
+        self.pause_check_remaining_ms = 0
+        self.save_queue_retry = 0
         self._set_memory_debug()
-        self.config = {}
-        with open('config.json', 'r') as f:
-            self.config = ujson.load(f)
+        self._load_save_queue()
+        self.config, config_error = self._load_config()
+        if log.level_from_name(self.config.log_level) is not None:
+            log.set_level(log.level_from_name(self.config.log_level))
 
-        if self.config['use_led']:
-            self.led = Pin(self.config['pins']['led'], Pin.OUT)
+        if self.config.use_led:
+            self.led = Pin(self.config.pins['led'], Pin.OUT)
             for v in [1, 0, 1]:
                 self.led.value(v)
                 time.sleep_ms(100)
             self.led.value(0)
 
-        if self.config['use_display']:
-            self.oled = oled.OLED(scl_pin = self.config['pins']['scl'], sda_pin = self.config['pins']['sda'], contrast = self.config['contrast'])
-            if self.config['low_contrast_mode']:
+        if self.config.use_display:
+            self.oled = oled.OLED(scl_pin = self.config.pins['scl'], sda_pin = self.config.pins['sda'], contrast = self.config.contrast,
+                                  bus = self.config.display_bus, dc_pin = self.config.pins.get('dc'),
+                                  res_pin = self.config.pins.get('res'), cs_pin = self.config.pins.get('cs'),
+                                  max_fps = self.config.display_max_fps, standby_hw_scroll = self.config.standby_hw_scroll)
+            if self.config.low_contrast_mode:
                 self.oled.oled.precharge(0x22)
         else:
             self.oled = oled.OLED(enable = False)
         self.oled.show(_app_name, "__init__", separator = False)
 
-        self._validate_config()
+        if config_error is not None:
+            self._raise_config_error(config_error)
 
-        if self.config['use_buzzer']:
-            self.buzzer = buzzer(Pin(self.config['pins']['buzzer'], Pin.OUT), frequency = self.config['buzzer_frequency'], duty = self.config['buzzer_duty'])
+        if self.config.use_buzzer:
+            self.buzzer = buzzer(Pin(self.config.pins['buzzer'], Pin.OUT), frequency = self.config.buzzer_frequency, duty = self.config.buzzer_duty)
             self.buzzer.buzz()
         else:
             self.buzzer = None
 
-        if not self.config['spotify'].get('client_id') or not self.config['spotify'].get('client_secret'):
+        if not self.config.spotify.get('client_id') or not self.config.spotify.get('client_secret'):
             self.oled.show(_app_name, "client not configured", separator = False)
             raise RuntimeError("client_id and/or client_secret not configured")
 
-        self.button_playpause = button_async(Pin(self.config['pins']['button_playpause'], Pin.IN, Pin.PULL_UP), long_press_duration_ms = self.config['long_press_duration_milliseconds'], buzzer = self.buzzer)
-        self.button_next = button_async(Pin(self.config['pins']['button_next'], Pin.IN, Pin.PULL_UP), long_press_duration_ms = self.config['long_press_duration_milliseconds'], buzzer = self.buzzer)
-        print("buttons enabled")
+        self.button_playpause = button_async(Pin(self.config.pins['button_playpause'], Pin.IN, Pin.PULL_UP), long_press_duration_ms = self.config.long_press_duration_milliseconds, buzzer = self.buzzer)
+        self.button_next = button_async(Pin(self.config.pins['button_next'], Pin.IN, Pin.PULL_UP), long_press_duration_ms = self.config.long_press_duration_milliseconds, buzzer = self.buzzer)
+        log.info("buttons enabled")
 
-        if self.config['setup_network']:
+        if self.config.setup_network:
             self.wlan_ap = network.WLAN(network.AP_IF)
             self.wlan_ap.active(False)
             self.wlan = network.WLAN(network.STA_IF)
             try:
                 self.wlan.active(True)
-                self.wlan.connect(self.config['wlan']['ssid'], self.config['wlan']['password'])
-                self.wlan.config(dhcp_hostname=self.config['wlan']['mdns'])
+                self.wlan.connect(self.config.wlan['ssid'], self.config.wlan['password'])
+                self.wlan.config(dhcp_hostname=self.config.wlan['mdns'])
             except Exception as e:
                 self.oled.show(e.__class__.__name__, str(e))
                 if str(e) == "Wifi Internal Error":
@@ -75,22 +99,28 @@ class Spotify:
                     machine.reset()
                 else:
                     raise
-            print("network configured")
+            log.info("network configured")
         else:
             self.wlan = network.WLAN()
-            print("using existing network configuration")
+            log.info("using existing network configuration")
+
+        if self.config.use_gzip:
+            spotify_api.set_gzip(True)
+
+        if self.config.api_trace_kb > 0:
+            spotify_api.set_trace(self.config.api_trace_kb * 1024)
 
-        if self.config['enable_webrepl']:
+        if self.config.enable_webrepl:
             import webrepl
             webrepl.start()
 
-        self._wait_for_connection()
+        self._wait_for_connection(reconnect = False)
 
         self.ip = self.wlan.ifconfig()[0]
-        self.redirect_uri = "http://{}.local/callback/".format(self.config['wlan']['mdns'])
+        self.redirect_uri = "http://{}.local/callback/".format(self.config.wlan['mdns'])
 
         self.oled.show(_app_name, "__init__ connected {}".format(self.ip), separator = False)
-        print("connected at {} as {}".format(self.ip, self.config['wlan']['mdns']))
+        log.info("connected at {} as {}", self.ip, self.config.wlan['mdns'])
 
     def _set_memory_debug(self):
         import os
@@ -103,61 +133,88 @@ class Spotify:
             pass
 
         if self.memdebug:
-            print("memory debug enabled")
+            log.info("memory debug enabled")
         else:
-            print("no \"memdebug\" file or directory found, memory debug output disabled")
+            log.info("no \"memdebug\" file or directory found, memory debug output disabled")
+
+    def _load_save_queue(self):
+        self.save_queue = []
+
+        try:
+            with open(_save_queue_file, 'r') as f:
+                for line in f:
+                    track_id = line.strip()
+                    if len(track_id) > 0 and track_id not in self.save_queue:
+                        self.save_queue.append(track_id)
+        except OSError:
+            pass
+
+        if len(self.save_queue) > 0:
+            log.info("{} queued track saves loaded", len(self.save_queue))
 
-    def _validate_config(self):
-        boolean_entries = const("use_display,use_led,use_buzzer,setup_network,enable_webrepl,show_progress_ticks,low_contrast_mode,blank_oled_on_standby")
-        integer_entries = const("contrast,status_poll_interval_seconds,standby_status_poll_interval_minutes,idle_standby_minutes,long_press_duration_milliseconds,api_request_dot_size,buzzer_frequency,buzzer_duty")
-        dict_entries = const("spotify,pins,wlan")
-        spotify_entries = const("client_id,client_secret")
-        pin_entries = const("led,scl,sda,button_playpause,button_next,buzzer")
-        wlan_entries = const("ssid,password,mdns")
+    def _write_save_queue(self):
+        import os
 
-        for b in boolean_entries.split(','):
-            if b not in self.config or type(self.config[b]) is not bool:
-                self._raise_config_error("\"{}\" not configured or not boolean".format(b))
+        if len(self.save_queue) == 0:
+            try:
+                os.remove(_save_queue_file)
+            except OSError:
+                pass
+            return
 
-        for i in integer_entries.split(','):
-            if i not in self.config or type(self.config[i]) is not int:
-                self._raise_config_error("\"{}\" not configured or not integer".format(i))
+        with open(_save_queue_file, 'w') as f:
+            for track_id in self.save_queue:
+                f.write(track_id)
+                f.write("\n")
 
-        for d in dict_entries.split(','):
-            if d not in self.config or type(self.config[d]) is not dict:
-                self._raise_config_error("\"{}\" not configured or not dict".format(d))
+    def _load_config(self):
+        # returns the config and the validation error of config.json, the
+        # compiled config module has already been validated when it was built
+        try:
+            import config
+        except ImportError:
+            config = None
 
-        for s in spotify_entries.split(','):
-            if s not in self.config['spotify'] or self.config['spotify'][s] is None or len(self.config['spotify'][s]) < 16:
-                self._raise_config_error("\"{}\" not configured or is invalid".format(s))
+        if config is not None:
+            log.info("using compiled config")
+            try:
+                import os
+                if os.stat('config.json')[6] != config.source_size:
+                    log.warning("config.json differs from the one compiled, ignoring it")
+            except OSError:
+                pass
+            return config, None
 
-        for p in pin_entries.split(','):
-            if p not in self.config['pins'] or type(self.config['pins'][p]) is not int:
-                self._raise_config_error("\"{}\" not configured or is invalid".format(p))
+        import configutils
 
-        for w in wlan_entries.split(','):
-            if w not in self.config['wlan'] or self.config['wlan'][w] is None or len(self.config['wlan'][w]) < 1:
-                self._raise_config_error("\"{}\" not configured or is invalid".format(w))
+        log.info("using config.json")
+        with open('config.json', 'r') as f:
+            config = configutils.with_defaults(ujson.load(f))
+        return configutils.Config(config), configutils.validate(config)
 
     def _raise_config_error(self, e):
         self.oled.show("config.json", e)
         raise RuntimeError(e)
 
-    def _wait_for_connection(self):
+    def _wait_for_connection(self, reconnect = True):
         was_connected = self.wlan.isconnected()
 
-        if not self.config['use_display'] and not self.wlan.isconnected():
-            print("waiting for connection...")
+        if not self.config.use_display and not self.wlan.isconnected():
+            log.info("waiting for connection...")
 
         while not self.wlan.isconnected():
-            if self.config['use_display']:
+            if self.config.use_display:
                 self.oled.show(_app_name, "waiting for connection", separator = False)
                 time.sleep_ms(500)
                 self.oled.show(_app_name, "waiting for connection", separator = True)
                 time.sleep_ms(500)
 
         if not was_connected:
+            if reconnect:
+                metrics.inc("wlan_reconnects_total")
             self._reset_button_presses()
+            # queued saves likely failed because of the connection, send them right away
+            self.save_queue_retry = 0
 
     def _reset_button_presses(self):
         self.button_playpause.reset_press()
@@ -173,24 +230,29 @@ class Spotify:
             return
 
         if self.button_playpause.was_pressed():
-            print("play/pause button pressed")
+            log.debug("play/pause button pressed")
             if playing:
                 if self.button_playpause.was_longpressed():
                     self.oled.show(_app_name, "saving track", separator = False)
-                    currently_playing = self._get_currently_playing(api_tokens)
-                    if currently_playing is not None:
-                        if 'item' in currently_playing and 'id' in currently_playing['item']:
-                            self._save_track(api_tokens, currently_playing['item'].get('id'))
+                    state = self._playback_for_save(api_tokens)
+                    if state is not None and state.type == 'track' and state.track_id is not None:
+                        self._queue_track_save(state.track_id)
+                        self._flush_save_queue(api_tokens)
+                        if len(self.save_queue) > 0:
+                            self.oled.show(_app_name, "track save queued", separator = False)
+                            time.sleep(2)
+                    else:
+                        self.oled.show(_app_name, "no track to save", separator = False)
+                        time.sleep(2)
                 else:
                     self.oled.show(_app_name, "pausing playback", separator = False)
-                    self.device_id = self._get_current_device_id(api_tokens)
                     self._pause_playback(api_tokens)
             else:
                 self.oled.show(_app_name, "resuming playback", separator = False)
                 self._resume_playback(api_tokens, self.device_id)
 
         elif self.button_next.was_pressed():
-            print("next button pressed")
+            log.debug("next button pressed")
             if playing:
                 if self.button_next.was_longpressed():
                     if self.pause_after_current:
@@ -198,7 +260,7 @@ class Spotify:
                         self.oled.show(_app_name, "not pausing after current", separator = False)
                         self.pause_after_current = False
                     else:
-                        self.oled.enable_status_dot(self.config['api_request_dot_size'])
+                        self.oled.enable_status_dot(self.config.api_request_dot_size)
                         self.oled.show(_app_name, "pausing after current", separator = False)
                         self.pause_after_current = True
                 else:
@@ -208,17 +270,40 @@ class Spotify:
                 self.oled.show(_app_name, "requesting next", separator = False)
                 self._next_playback(api_tokens, self.device_id)
 
+        if self.button_playpause.was_pressed():
+            metrics.observe("button_action_ms", self.button_playpause.ms_since_press(), (("button", "playpause"),))
+        else:
+            metrics.observe("button_action_ms", self.button_next.ms_since_press(), (("button", "next"),))
+
         self._reset_button_presses()
 
+    def _playback_for_save(self, api_tokens):
+        # the state of the previous poll may no longer be what is playing once it's older than
+        # playback_cache_ttl_ms or its track has ended, poll again so that the track being heard gets saved
+        state = self.playback
+        if state is None:
+            return None
+        ended = state.has_progress() and state.progress_now_ms() > state.duration_ms
+        if not ended and state.age_ms() <= self.config.playback_cache_ttl_ms:
+            return state
+
+        log.debug("playback state {} ms old, polling before saving", state.age_ms())
+        polled = self._get_currently_playing(api_tokens)
+        if polled is False:
+            # without a reply the cached track is still the right one if it hasn't ended
+            return None if ended else state
+        self.playback = polled
+        return polled
+
     def _validate_api_reply(self, api_call_name, api_reply, ok_status_list = [], warn_status_list = [], raise_status_list = [], warn_duration_ms = 5000):
-        print("{} status received: {}".format(api_call_name, api_reply['status_code']))
+        log.debug("{} status received: {}", api_call_name, api_reply['status_code'])
 
         if api_reply['status_code'] in ok_status_list:
             return True
 
         if api_reply['status_code'] in warn_status_list:
             warning_text = "{} api {}: {}".format(api_call_name, api_reply['status_code'], api_reply['text'])
-            print(warning_text)
+            log.warning(warning_text)
             self.oled.show(_app_name, warning_text, separator = False)
             time.sleep_ms(warn_duration_ms)
             return False
@@ -231,29 +316,28 @@ class Spotify:
         raise RuntimeError("{} api unhandled status_code {} - {}".format(api_call_name, api_reply['status_code'], api_reply['text']))
 
     def _get_api_tokens(self, authorization_code):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
-        r = spotify_api.get_api_tokens(authorization_code, self.redirect_uri, self.config['spotify']['client_id'], self.config['spotify']['client_secret'])
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
+        r = spotify_api.get_api_tokens(authorization_code, self.redirect_uri, self.config.spotify['client_id'], self.config.spotify['client_secret'])
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
 
         self._validate_api_reply("token", r, ok_status_list = [200])
 
-        print("api tokens received")
         api_tokens = r['json']
-
-        print("received: {}".format(api_tokens))
+        log.info("api tokens received, expires in {} s", api_tokens.get('expires_in'))
         api_tokens['timestamp'] = time.time()
 
         if 'refresh_token' in api_tokens:
             with open('refresh_token.txt', 'w') as f:
                 f.write(api_tokens['refresh_token'])
-            print("refresh_token.txt created")
+            log.info("refresh_token.txt created")
 
         return api_tokens
 
     def _refresh_access_token(self, api_tokens):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
-        r = spotify_api.refresh_access_token(api_tokens, self.config['spotify']['client_id'], self.config['spotify']['client_secret'])
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
+        r = spotify_api.refresh_access_token(api_tokens, self.config.spotify['client_id'], self.config.spotify['client_secret'])
+        metrics.inc("token_refreshes_total")
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
 
         warn_status_list = []
         if 'timestamp' in api_tokens:
@@ -262,181 +346,271 @@ class Spotify:
         if not self._validate_api_reply("refresh", r, ok_status_list = [200], warn_status_list = warn_status_list):
             return api_tokens
 
-        print("refreshed api tokens received")
         new_api_tokens = r['json']
-
-        print("received: {}".format(new_api_tokens))
+        log.debug("refreshed api tokens received, expires in {} s", new_api_tokens.get('expires_in'))
         new_api_tokens['timestamp'] = time.time()
 
         if 'refresh_token' in new_api_tokens:
             if new_api_tokens['refresh_token'] != api_tokens['refresh_token']:
                 with open('refresh_token.txt', 'w') as f:
                     f.write(new_api_tokens['refresh_token'])
-                print("refresh_token.txt updated")
+                log.info("refresh_token.txt updated")
         else:
             new_api_tokens['refresh_token'] = api_tokens['refresh_token']
 
         return new_api_tokens
 
     def _get_currently_playing(self, api_tokens):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
-        r = spotify_api.get_currently_playing(api_tokens)
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
+        r = spotify_api.get_player(api_tokens)
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
 
-        if not self._validate_api_reply("c-playing", r, ok_status_list = [200, 202, 204], warn_status_list = [0, 401, 403, 429]):
-            return {'warn_shown': 1}
+        if not self._validate_api_reply("player", r, ok_status_list = [200, 202, 204], warn_status_list = [0, 401, 403, 429]):
+            return False
 
         if r['status_code'] != 200:
+            self._report_pause_accuracy(None, False)
             return None
 
-        if 'is_playing' not in r['json'] or r['json']['is_playing'] is not True or 'item' not in r['json']:
-            if 'is_playing' not in r['json']:
-                print("missing content, status unknown: {}".format(r['json']))
-            return None
-
-        return r['json']
+        player_status = r['json']
+        del r
 
-    def _get_current_device_id(self, api_tokens):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
-        r = spotify_api.get_current_device_id(api_tokens)
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        if 'is_playing' not in player_status:
+            log.warning("missing content, status unknown: {}", list(player_status))
+            self._report_pause_accuracy(None, False)
+            return None
 
-        self._validate_api_reply("player", r, ok_status_list = [200], warn_status_list = [202, 204, 401, 403, 429])
+        # only the fields used for showing the status are kept, the decoded reply is released on return
+        state = playback.PlaybackState(player_status)
 
-        print("player received")
+        self._report_pause_accuracy(state, player_status['is_playing'])
 
-        player_status = r['json']
+        if state.device_id is not None and state.device_id != self.device_id:
+            self.device_id = state.device_id
+            log.debug("current device id: {}", self.device_id)
 
-        device_id = None
-        if 'device' in player_status:
-            if 'id' in player_status['device']:
-                if player_status['device']['id'] is not None and len(player_status['device']['id']) > 8:
-                    device_id = player_status['device']['id']
-                    print("current device id: {}".format(device_id))
+        if player_status['is_playing'] is not True or player_status.get('item') is None:
+            return None
 
-        return device_id
+        return state
 
     def _pause_playback(self, api_tokens):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
+        request_begins = time.ticks_ms()
         r = spotify_api.pause_playback(api_tokens)
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        round_trip_ms = time.ticks_diff(time.ticks_ms(), request_begins)
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
+
+        if not self._validate_api_reply("pause", r, ok_status_list = [200, 202, 204], warn_status_list = [0, 401, 403, 429]):
+            return None
 
-        self._validate_api_reply("pause", r, ok_status_list = [200, 202, 204], warn_status_list = [0, 401, 403, 429])
+        metrics.observe("pause_round_trip_ms", round_trip_ms)
+        log.debug("playback paused, round trip {} ms", round_trip_ms)
+
+        return r
+
+    def _pause_after_current(self, api_tokens, state):
+        remaining_ms = state.duration_ms - state.progress_now_ms()
+        r = self._pause_playback(api_tokens)
+        if r is None:
+            return
+        self.pause_check_track_id = state.track_id
+        self.pause_check_duration_ms = state.duration_ms
+        self.pause_check_end_ticks_ms = time.ticks_add(time.ticks_ms(), state.duration_ms - state.progress_now_ms())
+        # a request sent again after a failure took effect later by the wait before
+        # the retry, so it doesn't tell how long it takes for a pause to take effect
+        self.pause_check_remaining_ms = None if r.get('retried', False) else remaining_ms
+
+    def _update_pause_latency(self, latency_ms):
+        # moving estimate of how long it takes for a pause request to take effect and of its
+        # mean deviation, measured from where the paused track stopped compared to how much of
+        # it remained when the request was sent, the pause gets sent the sum of the two before
+        # the end of the track
+        if latency_ms < 0:
+            latency_ms = 0
+        self.pause_latency_dev_ms = (self.pause_latency_dev_ms * 3 + abs(latency_ms - self.pause_latency_ms)) // 4
+        self.pause_latency_ms = (self.pause_latency_ms * 3 + latency_ms) // 4
+        log.debug("pause latency {} ms, estimate {} ms, deviation {} ms", latency_ms, self.pause_latency_ms, self.pause_latency_dev_ms)
+
+    def _report_pause_accuracy(self, state, is_playing):
+        if self.pause_check_track_id is None:
+            return
 
-        print("playback paused")
+        # only the first successful poll after the pause is used, a reply without the
+        # paused track (no active device, another track selected) can't tell how it went
+        if state is not None and state.track_id == self.pause_check_track_id:
+            if is_playing is not True and state.progress_ms is not None:
+                early_ms = self.pause_check_duration_ms - state.progress_ms
+                metrics.observe("pause_after_current_early_ms", early_ms)
+                log.info("paused after current {} ms before end of track, latency estimate {} ms", early_ms, self.pause_latency_ms)
+                if self.pause_check_remaining_ms is not None:
+                    self._update_pause_latency(self.pause_check_remaining_ms - early_ms)
+            elif is_playing is True and time.ticks_diff(state.fetched_ticks_ms, self.pause_check_end_ticks_ms) > 0:
+                metrics.inc("pause_after_current_missed_total")
+                log.warning("pause after current missed the end of track, latency estimate {} ms", self.pause_latency_ms)
+            else:
+                log.debug("pause after current not verified, track still playing before its end")
+        elif (state is not None and is_playing is not True and state.progress_ms is not None
+              and state.progress_ms <= time.ticks_diff(state.fetched_ticks_ms, self.pause_check_end_ticks_ms) + _pause_late_slack_ms):
+            # the pause reached the playback client only after it had moved on to the next track
+            metrics.inc("pause_after_current_missed_total")
+            metrics.observe("pause_after_current_late_ms", state.progress_ms)
+            log.warning("paused after current {} ms into the next track, latency estimate {} ms", state.progress_ms, self.pause_latency_ms)
+            if self.pause_check_remaining_ms is not None:
+                self._update_pause_latency(self.pause_check_remaining_ms + state.progress_ms)
+        else:
+            log.debug("pause after current not verified, paused track not in reply")
+        self.pause_check_track_id = None
 
     def _resume_playback(self, api_tokens, device_id = None):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
         r = spotify_api.resume_playback(api_tokens, device_id = device_id)
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
 
         self._validate_api_reply("resume", r, ok_status_list = [200, 202, 204, 404], warn_status_list = [403])
 
         if r['status_code'] == 404:
-            print("no active device found")
+            log.warning("no active device found")
             self.oled.show(_app_name, "no active device found", separator = False)
             time.sleep(3)
         else:
-            print("playback resuming")
+            log.debug("playback resuming")
 
     def _next_playback(self, api_tokens, device_id = None):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
         r = spotify_api.next_playback(api_tokens, device_id = device_id)
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
 
         self._validate_api_reply("next", r, ok_status_list = [200, 202, 204, 404], warn_status_list = [0, 401, 403, 429])
 
         if r['status_code'] == 404:
-            print("no active device found")
+            log.warning("no active device found")
             self.oled.show(_app_name, "no active device found", separator = False)
             time.sleep(3)
         else:
-            print("playback next")
+            log.debug("playback next")
+
+    def _queue_track_save(self, track_id):
+        if track_id in self.save_queue:
+            log.debug("track {} already queued for saving", track_id)
+            return
+
+        self.save_queue.append(track_id)
+        self._write_save_queue()
+        self.save_queue_retry = 0
 
-    def _save_track(self, api_tokens, track_id):
-        self.oled.show_corner_dot(self.config['api_request_dot_size'])
-        r = spotify_api.save_track(api_tokens, track_id)
-        self.oled.hide_corner_dot(self.config['api_request_dot_size'])
+    def _flush_save_queue(self, api_tokens):
+        track_ids = self.save_queue[:_save_queue_batch_size]
 
-        self._validate_api_reply("save track", r, ok_status_list = [200, 202, 204], warn_status_list = [0, 401, 403, 429])
+        self.oled.show_corner_dot(self.config.api_request_dot_size)
+        r = spotify_api.save_tracks(api_tokens, track_ids)
+        self.oled.hide_corner_dot(self.config.api_request_dot_size)
+
+        log.debug("save tracks status received: {}", r['status_code'])
+
+        if r['status_code'] in [200, 202, 204]:
+            log.debug("{} track(s) saved", len(track_ids))
+        elif r['status_code'] in [0, 401, 429] or r['status_code'] >= 500:
+            log.warning("save tracks failed, {} track(s) remain queued", len(self.save_queue))
+            self.save_queue_retry = time.time() + _save_queue_retry_seconds
+            return
+        else:
+            # other failures, such as 403 without the user-library-modify scope, won't go away by retrying
+            self._validate_api_reply("save", r, warn_status_list = [r['status_code']])
+            log.warning("dropping {} track(s) from save queue", len(track_ids))
 
-        print("track saved")
+        self.save_queue = self.save_queue[len(track_ids):]
+        self._write_save_queue()
+        self.save_queue_retry = 0
 
-    def _initial_token_request(self):
+    async def _initial_token_request(self):
         import spotify_auth
         import machine
 
-        self.oled.show("Login", "http:// {}.local".format(self.config['wlan']['mdns']), separator = False)
-        authorization_code = spotify_auth.get_authorization_code(self.config['spotify']['client_id'], self.redirect_uri, self.ip, self.config['wlan']['mdns'])
+        self.oled.show("Login", "http:// {}.local".format(self.config.wlan['mdns']), separator = False)
+        authorization_code = await spotify_auth.get_authorization_code(self.config.spotify['client_id'], self.redirect_uri, self.ip, self.config.wlan['mdns'])
 
         if authorization_code == None:
             self.oled.show(_app_name, "get_auth_code() failed", separator = False)
             raise RuntimeError("get_auth_code() failed")
 
         self.oled.show(_app_name, "authorized", separator = False)
-        print("authorization_code content: {}".format(authorization_code))
+        log.debug("authorization_code content: {}", log.redact(authorization_code))
 
-        self._get_api_tokens(authorization_code)
+        api_tokens = self._get_api_tokens(authorization_code)
+        warmstate.save(api_tokens, None, None)
 
         self.oled.show(_app_name, "authorized, rebooting", separator = False)
         time.sleep(2)
         machine.reset()
 
-    async def _show_play_progress_for_seconds(self, api_tokens, cp, seconds):
-        if 'progress_ms' not in cp or 'duration_ms' not in cp['item']:
-            if cp.get('currently_playing_type', '') == 'track':
-                self.oled.show(cp['item'].get('artists', [{}])[0].get('name', 'Unknown Artist'), cp['item'].get('name', 'Unknown Track'))
-            elif cp.get('currently_playing_type', '') == 'episode':
-                self.oled.show(cp['item'].get('show', {}).get('name', 'Unknown Podcast'), cp['item'].get('name', 'Unknown Episode'))
-            else:
-                self.oled.show("Unknown content", "")
+    def _restore_warm_state(self, refresh_token):
+        warm = warmstate.load()
+        if warm is None:
+            return None
+
+        self.device_id = warm['device_id']
+        self.playback = warm['playback']
+
+        api_tokens = warm['api_tokens']
+        if api_tokens is None or time.time() >= api_tokens['timestamp'] + api_tokens['expires_in'] - 30:
+            log.info("warm restart, access token needs refreshing")
+            return None
+
+        api_tokens['refresh_token'] = refresh_token
+        log.info("warm restart, access token valid for {} s", api_tokens['timestamp'] + api_tokens['expires_in'] - time.time())
+        return api_tokens
+
+    def _show_restored_playback(self):
+        state = self.playback
+        if not state.has_progress():
+            self.oled.show(state.artist, state.title)
+        # a track that has already ended by now would only flash before the first poll replaces it
+        elif state.progress_now_ms() <= state.duration_ms:
+            self.oled.show(state.artist, state.title, progress = state.progress_now_ms(), ticks = self.config.show_progress_ticks, progress_max = state.duration_ms)
+
+    async def _show_play_progress_for_seconds(self, api_tokens, state, seconds):
+        if not state.has_progress():
+            self.oled.show(state.artist, state.title)
             await asyncio.sleep(seconds)
-        else:
-            show_progress = True
-            progress_start = time.time()
-            progress = None
-
-            if 'progress_ms' in cp and 'duration_ms' in cp['item']:
-                progress_ms = cp['progress_ms']
-                progress = True
-
-            while True:
-                interval_begins = time.ticks_ms()
-
-                if progress is not None:
-                    # compared remaining playback time needs to be longer than the 1000 ms loop interval and some approximation
-                    # of the time it takes for the Spotify API call to get executed from display to Spotify server and
-                    # then from Spotify server to playback client, the API doesn't directly support "pause after current",
-                    # pausing early rather than late appears to be the better option
-                    if self.pause_after_current and cp['item']['duration_ms'] - progress_ms <= 2000:
-                        self._pause_playback(api_tokens)
-                        break
-                    if progress_ms > cp['item']['duration_ms']:
-                        break
-                    progress = progress_ms / cp['item']['duration_ms'] * 100
-
-                playing_artist = "Unknown content"
-                playing_title = ""
-
-                if cp.get('currently_playing_type', '') == 'track':
-                    playing_artist = cp['item'].get('artists', [{}])[0].get('name', 'Unknown Artist')
-                    playing_title = cp['item'].get('name', 'Unknown Track')
-                elif cp.get('currently_playing_type', '') == 'episode':
-                    playing_artist = cp['item'].get('show', {}).get('name', 'Unknown Podcast')
-                    playing_title = cp['item'].get('name', 'Unknown Episode')
-
-                if show_progress:
-                    self.oled.show(playing_artist, playing_title, progress = progress, ticks = self.config['show_progress_ticks'])
-                    if not self.config['use_display']:
-                        show_progress = False
-
-                if time.time() >= progress_start + seconds:
-                    break
+            return
 
-                if await self._wait_for_button_press_ms(1000):
+        show_progress = True
+        show_ticks = self.config.show_progress_ticks
+        progress_start = time.ticks_ms()
+
+        while True:
+            progress_ms = state.progress_now_ms()
+
+            # the API doesn't directly support "pause after current", so the pause request is sent when the
+            # remaining playback time equals the measured estimate of how long the request takes to reach
+            # the playback client, the last wait before that is shortened to end exactly at that moment
+            if self.pause_after_current:
+                pause_in_ms = state.duration_ms - progress_ms - self.pause_latency_ms - self.pause_latency_dev_ms
+                if pause_in_ms < 1000:
+                    if pause_in_ms <= 0 or not await self._wait_for_button_press_ms(pause_in_ms):
+                        self._pause_after_current(api_tokens, state)
                     break
+            if progress_ms > state.duration_ms:
+                break
+
+            if show_progress:
+                self.oled.show(state.artist, state.title, progress = progress_ms, ticks = show_ticks, progress_max = state.duration_ms)
+                if not self.config.use_display:
+                    show_progress = False
+
+            if time.ticks_diff(time.ticks_ms(), progress_start) >= seconds * 1000:
+                break
 
-                progress_ms += time.ticks_diff(time.ticks_ms(), interval_begins)
+            # same as _wait_for_button_press_ms(1000) but without creating a coroutine every second,
+            # nothing in this loop allocates once the layout of the track has been done
+            interval_begins = time.ticks_ms()
+            button_pressed = self._check_button_presses()
+            while not button_pressed and time.ticks_diff(time.ticks_ms(), interval_begins) < 1000:
+                await asyncio.sleep_ms(50)
+                button_pressed = self._check_button_presses()
+            if button_pressed:
+                break
 
     async def _wait_for_button_press_ms(self, milliseconds):
         interval_begins = time.ticks_ms()
@@ -449,12 +623,12 @@ class Spotify:
         return button_pressed
 
     async def _standby(self):
-        print("standby")
+        log.debug("standby")
         self._reset_button_presses()
         button_pressed = self._check_button_presses()
 
-        if self.config['blank_oled_on_standby']:
-            self.oled.clear()
+        if self.config.blank_oled_on_standby:
+            self.oled.blank()
         else:
             self.oled.standby()
             oled_updated = time.time()
@@ -462,14 +636,14 @@ class Spotify:
         standby_start = time.time()
 
         while not button_pressed:
-            if not self.config['blank_oled_on_standby']:
-                if time.time() >= oled_updated + 10:
-                    self.oled.standby()
-                    oled_updated = time.time()
+            # only moves the pixel when the display isn't scrolling it on its own
+            if not self.config.blank_oled_on_standby and time.time() >= oled_updated + _standby_pixel_interval_seconds:
+                self.oled.standby()
+                oled_updated = time.time()
             button_pressed = await self._wait_for_button_press_ms(1000)
-            if self.config['standby_status_poll_interval_minutes'] > 0:
-                if time.time() >= standby_start + ( 60 * self.config['standby_status_poll_interval_minutes'] ):
-                    print("standby status poll")
+            if self.config.standby_status_poll_interval_minutes > 0:
+                if time.time() >= standby_start + ( 60 * self.config.standby_status_poll_interval_minutes ):
+                    log.debug("standby status poll")
                     break
 
         if button_pressed:
@@ -484,17 +658,17 @@ class Spotify:
         loop_begins = time.time()
         show_progress = True
 
-        while loop_begins + (self.config['status_poll_interval_seconds'] - 1) > time.time():
+        while loop_begins + (self.config.status_poll_interval_seconds - 1) > time.time():
 
-            standby_time = last_playing + self.config['idle_standby_minutes'] * 60
-            progress = (standby_time - time.time()) / (self.config['idle_standby_minutes'] * 60) * 100
+            standby_time = last_playing + self.config.idle_standby_minutes * 60
+            progress = (standby_time - time.time()) / (self.config.idle_standby_minutes * 60) * 100
 
             if time.time() >= standby_time:
                 return True
 
             if show_progress:
                 self.oled.show("Spotify", "not playing", progress = progress, ticks = False)
-                if not self.config['use_display']:
+                if not self.config.use_display:
                     show_progress = False
 
             if await self._wait_for_button_press_ms(1000):
@@ -505,6 +679,9 @@ class Spotify:
     async def _looper(self):
         self.oled.show(_app_name, "start", separator = False)
 
+        if self.config.metrics_port > 0:
+            await metrics.start(self.config.metrics_port)
+
         api_tokens = None
 
         try:
@@ -513,22 +690,28 @@ class Spotify:
             refresh_token_file = None
 
         if refresh_token_file is None:
-            self._initial_token_request()
+            await self._initial_token_request()
         else:
             refresh_token = refresh_token_file.readline().strip()
             refresh_token_file.close()
-            api_tokens = self._refresh_access_token({ 'refresh_token': refresh_token })
+            api_tokens = self._restore_warm_state(refresh_token)
+            if api_tokens is None:
+                api_tokens = self._refresh_access_token({ 'refresh_token': refresh_token })
 
         self.oled.show(_app_name, "tokenized", separator = False)
-        print("api_tokens content: {}".format(api_tokens))
+
+        if self.playback is not None:
+            self._show_restored_playback()
 
         playing = False
         last_playing = time.time()
         self._reset_button_presses()
 
+        # collections are left to the threshold instead of forcing one on every loop
+        gc.collect()
+        gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+
         while True:
-            gc.collect()
-            gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
             if self.memdebug:
                 mem_info()
 
@@ -542,22 +725,27 @@ class Spotify:
 
             self._handle_buttons(api_tokens, playing)
 
-            currently_playing = self._get_currently_playing(api_tokens)
+            if len(self.save_queue) > 0 and time.time() >= self.save_queue_retry:
+                self._flush_save_queue(api_tokens)
 
-            if currently_playing is not None:
-                if 'warn_shown' in currently_playing:
-                    continue
+            state = self._get_currently_playing(api_tokens)
+
+            if state is False:
+                continue
+
+            self.playback = state
+            warmstate.save(api_tokens, self.device_id, state)
+
+            if state is not None:
                 playing = True
                 last_playing = time.time()
-                if self.device_id is None:
-                    self.device_id = self._get_current_device_id(api_tokens)
             else:
                 playing = False
                 self.pause_after_current = False
                 self.oled.disable_status_dot()
 
             if playing:
-                await self._show_play_progress_for_seconds(api_tokens, currently_playing, self.config['status_poll_interval_seconds'])
+                await self._show_play_progress_for_seconds(api_tokens, state, self.config.status_poll_interval_seconds)
             else:
                 if await self._start_standby(last_playing):
                     if await self._standby():
@@ -569,10 +757,12 @@ class Spotify:
         try:
             loop.run_until_complete(self._looper())
         except KeyboardInterrupt:
-            print("keyboard interrupt received, stopping")
+            log.info("keyboard interrupt received, stopping")
             self.oled.clear()
         except RuntimeError:
+            log.dump()
             raise
         except Exception as e:
             self.oled.show(e.__class__.__name__, str(e))
+            log.dump()
             raise
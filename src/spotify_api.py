@@ -3,36 +3,110 @@
 # https://github.com/vergoh/micropython-spotify-status-display
 
 import gc
+import os
 import time
+import ujson
 from micropython import const
 
 # imports from additional files
+import log
+import metrics
 import uurequests as requests
 from helpers import b64encode, urlencode
 
 _spotify_account_api_base = const("https://accounts.spotify.com/api")
 _spotify_api_base = const("https://api.spotify.com")
 
+_trace_file = const("api_trace.jsonl")
+_redacted_entries = ("access_token", "refresh_token")
+
+_options = {'gzip': False, 'trace_bytes': 0, 'trace_start': 0}
+
+def set_gzip(enabled):
+    _options['gzip'] = enabled
+
+def set_trace(max_bytes):
+    # appends to the trace of previous boots until the file reaches max_bytes,
+    # tools/replay.py feeds the trace back through uurequests on the host
+    try:
+        used = os.stat(_trace_file)[6]
+    except OSError:
+        used = 0
+    _options['trace_bytes'] = max_bytes - used
+    _options['trace_start'] = time.ticks_ms()
+    if _options['trace_bytes'] > 0:
+        log.info("recording api trace to {}, {} bytes left", _trace_file, _options['trace_bytes'])
+        _write_trace({'boot': time.time()})
+
+def _write_trace(entry):
+    line = ujson.dumps(entry) + "\n"
+    if len(line) > _options['trace_bytes']:
+        _options['trace_bytes'] = 0
+        log.info("api trace {} full, recording stopped", _trace_file)
+        return
+    _options['trace_bytes'] -= len(line)
+    with open(_trace_file, 'a') as f:
+        f.write(line)
+
+def _trace(method, url, request_start, r, error):
+    # the reply content gets read here and stays cached in r for the caller,
+    # request headers and data are left out as they carry the credentials
+    entry = {'t': time.ticks_diff(request_start, _options['trace_start']), 'method': method, 'url': url}
+    if r is None:
+        entry['status'] = 0
+        entry['error'] = error
+    else:
+        entry['status'] = r.status_code
+        entry['headers'] = r.headers
+        try:
+            body = r.text
+        except Exception as e:
+            body = ""
+            entry['error'] = str(e)
+        if "/api/token" in url and len(body) > 0:
+            try:
+                tokens = ujson.loads(body)
+                for key in _redacted_entries:
+                    if key in tokens:
+                        tokens[key] = "redacted"
+                body = ujson.dumps(tokens)
+            except ValueError:
+                pass
+        entry['body'] = body
+    entry['ms'] = time.ticks_diff(time.ticks_ms(), request_start)
+    _write_trace(entry)
+
 def _spotify_api_request(method, url, data = None, headers = None, retry = True):
     ret = {'status_code': 0, 'json': {}, 'text': 'No reply content'}
-    print("{} {}".format(method, url))
+    log.debug("{} {}", method, url)
+    request_start = time.ticks_ms()
     try:
-        r = requests.request(method, url, data = data, headers = headers)
+        r = requests.request(method, url, data = data, headers = headers, gzip = _options['gzip'])
     except OSError as e:
-        print("OSError: {}".format(e))
+        log.warning("OSError: {}", e)
         ret['text'] = str(e)
         r = None
 
+    if _options['trace_bytes'] > 0:
+        _trace(method, url, request_start, r, ret['text'] if r is None else None)
+
+    if metrics.enabled():
+        endpoint = url.split("?", 1)[0].split("/", 3)[3]
+        metrics.inc("api_requests_total", (("endpoint", endpoint), ("status", r.status_code if r is not None else 0)))
+        metrics.observe("api_request_duration_ms", time.ticks_diff(time.ticks_ms(), request_start), (("endpoint", endpoint),))
+
     if r is None or r.status_code < 200 or r.status_code >= 500:
         if retry:
             if r is None:
-                print("failed, retrying...")
+                log.warning("failed, retrying...")
             elif r is not None:
-                print("status {}, retrying...".format(r.status_code))
+                log.warning("status {}, retrying...", r.status_code)
                 r.close()
                 del r
             time.sleep_ms(500)
-            return _spotify_api_request(method, url, data = data, headers = headers, retry = False)
+            ret = _spotify_api_request(method, url, data = data, headers = headers, retry = False)
+            ret['retried'] = True
+            return ret
         else:
             return ret
 
@@ -41,15 +115,17 @@ def _spotify_api_request(method, url, data = None, headers = None, retry = True)
         ret['json'] = r.json()
     except Exception as e:
         if r.status_code == 200 and method == "GET":
-            print("json decoding failed: {}".format(e))
+            log.warning("json decoding failed: {}", e)
             if retry:
                 if r is not None:
                     r.close()
                     del r
-                print("retrying...")
+                log.warning("retrying...")
                 time.sleep_ms(500)
                 gc.collect()
-                return _spotify_api_request(method, url, data = data, headers = headers, retry = False)
+                ret = _spotify_api_request(method, url, data = data, headers = headers, retry = False)
+                ret['retried'] = True
+                return ret
             ret['status_code'] = 0
             ret['json'] = {'exception': 1}
             ret['text'] = str(e)
@@ -72,7 +148,7 @@ def get_api_tokens(authorization_code, redirect_uri, client_id, client_secret):
     spotify_token_api_url = "{}/token".format(_spotify_account_api_base)
     reqdata = { 'grant_type': 'authorization_code', 'code': authorization_code, 'redirect_uri': redirect_uri }
 
-    b64_auth = "Basic {}".format(b64encode(b"{}:{}".format(client_id, client_secret)).decode())
+    b64_auth = "Basic {}".format(b64encode("{}:{}".format(client_id, client_secret).encode()).decode())
     headers = { 'Content-Type': 'application/x-www-form-urlencoded', 'Authorization': b64_auth }
 
     return _spotify_api_request("POST", spotify_token_api_url, data = urlencode(reqdata), headers = headers)
@@ -81,19 +157,13 @@ def refresh_access_token(api_tokens, client_id, client_secret):
     spotify_token_api_url = "{}/token".format(_spotify_account_api_base)
     reqdata = { 'grant_type': 'refresh_token', 'refresh_token': api_tokens['refresh_token'] }
 
-    b64_auth = "Basic {}".format(b64encode(b"{}:{}".format(client_id, client_secret)).decode())
+    b64_auth = "Basic {}".format(b64encode("{}:{}".format(client_id, client_secret).encode()).decode())
     headers = { 'Content-Type': 'application/x-www-form-urlencoded', 'Authorization': b64_auth }
 
     return _spotify_api_request("POST", spotify_token_api_url, data = urlencode(reqdata), headers = headers)
 
-def get_currently_playing(api_tokens):
-    spotify_player_api_url = "{}/v1/me/player/currently-playing?additional_types=track,episode".format(_spotify_api_base)
-    headers = { 'Authorization': "Bearer {}".format(api_tokens['access_token']) }
-
-    return _spotify_api_request("GET", spotify_player_api_url, headers = headers)
-
-def get_current_device_id(api_tokens):
-    spotify_player_api_url = "{}/v1/me/player".format(_spotify_api_base)
+def get_player(api_tokens):
+    spotify_player_api_url = "{}/v1/me/player?additional_types=track,episode".format(_spotify_api_base)
     headers = { 'Authorization': "Bearer {}".format(api_tokens['access_token']) }
 
     return _spotify_api_request("GET", spotify_player_api_url, headers = headers)
@@ -120,8 +190,8 @@ def next_playback(api_tokens, device_id = None):
 
     return _spotify_api_request("POST", spotify_player_api_url, headers = headers)
 
-def save_track(api_tokens, track_id):
-    spotify_me_api_url = "{}/v1/me/tracks?ids={}".format(_spotify_api_base, track_id)
+def save_tracks(api_tokens, track_ids):
+    spotify_me_api_url = "{}/v1/me/tracks?ids={}".format(_spotify_api_base, ",".join(track_ids))
     headers = { 'Authorization': "Bearer {}".format(api_tokens['access_token']) }
 
     return _spotify_api_request("PUT", spotify_me_api_url, headers = headers)
@@ -2,43 +2,48 @@
 # Copyright (c) 2023 Teemu Toivola
 # https://github.com/vergoh/micropython-spotify-status-display
 
-import socket
-import select
+import uasyncio as asyncio
+from micropython import const
 
-def get_authorization_code(client_id, redirect_uri, ip, mdns):
+# imports from additional files
+import log
+
+_client_timeout_seconds = const(10)
+
+async def _read_request_path(reader):
+    reqpath = None
+    while True:
+        line = await reader.readline()
+        if not line or line == b'\r\n':
+            break
+        if line.startswith(b'GET '):
+            reqpath = line.decode().strip().split(" ")[1]
+            # query parameters are left out as the callback contains the authorization code
+            log.debug("GET {}", reqpath.split('?')[0])
+    return reqpath
+
+async def _send_reply(writer, status, content_type, content):
+    writer.write("HTTP/1.0 {}\r\nContent-type: {}\r\nConnection: close\r\n\r\n".format(status, content_type).encode())
+    writer.write(content.encode())
+    await writer.drain()
+
+async def get_authorization_code(client_id, redirect_uri, ip, mdns):
     spotify_auth_url = "https://accounts.spotify.com/authorize"
     scopes = "user-read-currently-playing user-read-playback-state user-modify-playback-state user-library-modify"
 
     user_login_url = "{}?client_id={}&response_type=code&redirect_uri={}&scope={}".format(spotify_auth_url, client_id, redirect_uri, scopes).replace(' ', '%20')
 
-    addr = socket.getaddrinfo('0.0.0.0', 80)[0][-1]
-    http_server = socket.socket()
-    http_server.bind(addr)
-    http_server.listen(1)
-    serv_counter = 0
-    callback_code = None
+    callback_received = asyncio.Event()
+    callback_params = {}
 
-    print("listening on {} as http://{} - login at http://{}.local".format(addr, ip, mdns))
+    async def handle_client(reader, writer):
+        log.debug("client connected from {}", writer.get_extra_info('peername'))
+        try:
+            reqpath = await asyncio.wait_for(_read_request_path(reader), _client_timeout_seconds)
 
-    while True:
-        read_sockets = [http_server]
-        (r, _, _) = select.select(read_sockets, [], [])
-
-        if http_server in r:
-            reqpath = None
-            cl, addr = http_server.accept()
-            print("client connected from {}".format(addr))
-            cl_file = cl.makefile('rwb', 0)
-            while True:
-                line = cl_file.readline()
-                if not line or line == b'\r\n':
-                    break
-                else:
-                    if line.startswith(b'GET '):
-                        print(line.decode().strip())
-                        reqpath = line.decode().strip().split(" ")[1]
-
-            if reqpath is not None and reqpath.startswith('/callback') and '?' in reqpath:
+            if callback_received.is_set():
+                await asyncio.wait_for(_send_reply(writer, "503 Service Unavailable", "text/plain", "Login already completed\r\n"), _client_timeout_seconds)
+            elif reqpath is not None and reqpath.startswith('/callback') and '?' in reqpath:
                 reqparams = reqpath.split('?')[1]
                 params = {}
                 for reqparam in reqparams.split('&'):
@@ -46,31 +51,42 @@ def get_authorization_code(client_id, redirect_uri, ip, mdns):
                     if len(p) != 2:
                         continue
                     params[p[0]] = p[1]
-                print("got params: {}".format(params))
-                cl.send('HTTP/1.0 200 OK\r\nContent-type: text/html\r\n\r\n')
+                log.debug("got params: {}", list(params))
                 if 'code' in params:
-                    cl.send("<html><head><title>Login complete</title></head><body>Login complete, this page can now be closed</body></html>\r\n")
+                    content = "<html><head><title>Login complete</title></head><body>Login complete, this page can now be closed</body></html>\r\n"
                 else:
-                    cl.send("<html><head><title>Login error</title></head><body>{}</body></html>\r\n".format(params))
-                cl.close()
-                callback_code = params.get('code')
-                print("reply reports error: {}".format(params.get('error')))
-                break
+                    content = "<html><head><title>Login error</title></head><body>{}</body></html>\r\n".format(params)
+                await asyncio.wait_for(_send_reply(writer, "200 OK", "text/html", content), _client_timeout_seconds)
+                callback_params.update(params)
+                callback_received.set()
             elif reqpath is not None and reqpath == '/':
-                print("not callback path, giving login")
-                cl.send('HTTP/1.0 200 OK\r\nContent-type: text/html\r\n\r\n')
-                cl.send("<head><title>Redirect to login</title><meta http-equiv=\"Refresh\" content=\"0; URL={}\"></head>".format(user_login_url))
-                cl.close()
+                log.debug("not callback path, giving login")
+                content = "<head><title>Redirect to login</title><meta http-equiv=\"Refresh\" content=\"0; URL={}\"></head>".format(user_login_url)
+                await asyncio.wait_for(_send_reply(writer, "200 OK", "text/html", content), _client_timeout_seconds)
             else:
-                print("unknown path, sending 404")
-                cl.send('HTTP/1.0 404 Not Found\r\nContent-type: text/plain\r\n\r\nNot Found\r\n')
-                cl.close()
+                log.debug("unknown path, sending 404")
+                await asyncio.wait_for(_send_reply(writer, "404 Not Found", "text/plain", "Not Found\r\n"), _client_timeout_seconds)
+        except asyncio.TimeoutError:
+            log.debug("client timed out")
+        except OSError as e:
+            log.debug("client error: {}", e)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    http_server = await asyncio.start_server(handle_client, '0.0.0.0', 80, backlog = 5)
 
-            serv_counter += 1
-            if serv_counter == 5:
-                print("counter limit reached")
-                break
+    log.info("listening on port 80 as http://{} - login at http://{}.local", ip, mdns)
+
+    await callback_received.wait()
 
     http_server.close()
+    await http_server.wait_closed()
+
+    if 'error' in callback_params:
+        log.warning("reply reports error: {}", callback_params.get('error'))
 
-    return callback_code
+    return callback_params.get('code')
@@ -25,6 +25,16 @@ SET_DISP_CLK_DIV    = const(0xd5)
 SET_PRECHARGE       = const(0xd9)
 SET_VCOM_DESEL      = const(0xdb)
 SET_CHARGE_PUMP     = const(0x8d)
+SET_HWSCROLL_OFF    = const(0x2e)
+SET_HWSCROLL_ON     = const(0x2f)
+SET_HWSCROLL_RIGHT  = const(0x26)
+SET_HWSCROLL_LEFT   = const(0x27)
+SET_HWSCROLL_VR     = const(0x29)
+SET_HWSCROLL_VL     = const(0x2a)
+SET_VSCROLL_AREA    = const(0xa3)
+
+# scroll step intervals in frames and their register values
+_scroll_intervals = {2: 0x07, 3: 0x04, 4: 0x05, 5: 0x00, 25: 0x06, 64: 0x01, 128: 0x02, 256: 0x03}
 
 
 class SSD1306:
@@ -69,6 +79,16 @@ class SSD1306:
     def poweroff(self):
         self.write_cmd(SET_DISP | 0x00)
 
+    def display(self, on):
+        self.write_cmd(SET_DISP | (on & 1))
+
+    def start_line(self, line):
+        self.write_cmd(SET_DISP_START_LINE | (line & 0x3f))
+
+    def display_offset(self, offset):
+        self.write_cmd(SET_DISP_OFFSET)
+        self.write_cmd(offset & 0x3f)
+
     def contrast(self, contrast):
         self.write_cmd(SET_CONTRAST)
         self.write_cmd(contrast)
@@ -95,18 +115,74 @@ class SSD1306:
         self.write_cmd(self.pages - 1)
         self.write_framebuf()
 
+    # Writes only columns x0..x1 of pages page0..page1, the rest of the
+    # display ram keeps its content.
+    def show_area(self, x0, x1, page0, page1):
+        offset = 0
+        if self.width == 64:
+            offset = 32
+        self.write_cmd(SET_COL_ADDR)
+        self.write_cmd(x0 + offset)
+        self.write_cmd(x1 + offset)
+        self.write_cmd(SET_PAGE_ADDR)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+        # the address wraps to x0 of the next page after x1
+        for page in range(page0, page1 + 1):
+            self.write_data(page * self.width + x0, x1 - x0 + 1)
+
     def fill(self, col):
         self.framebuf.fill(col)
 
     def pixel(self, x, y, col):
         self.framebuf.pixel(x, y, col)
 
+    def hline(self, x, y, w, col):
+        self.framebuf.hline(x, y, w, col)
+
+    def vline(self, x, y, h, col):
+        self.framebuf.vline(x, y, h, col)
+
+    def fill_rect(self, x, y, w, h, col):
+        self.framebuf.fill_rect(x, y, w, h, col)
+
     def scroll(self, dx, dy):
         self.framebuf.scroll(dx, dy)
 
     def text(self, string, x, y, col=1):
         self.framebuf.text(string, x, y, col)
 
+    # The panel scrolls its own ram content continuously once started, no
+    # further commands or transfers are needed. The ram content needs to be
+    # written again after hw_scroll_stop().
+    def hw_scroll_horizontal(self, left=False, frames=256, start_page=0, end_page=None):
+        if end_page is None:
+            end_page = self.pages - 1
+        for cmd in (
+            SET_HWSCROLL_OFF,
+            SET_HWSCROLL_LEFT if left else SET_HWSCROLL_RIGHT,
+            0x00, start_page, _scroll_intervals[frames], end_page,
+            0x00, 0xff,
+            SET_HWSCROLL_ON):
+            self.write_cmd(cmd)
+
+    def hw_scroll_diagonal(self, left=False, frames=256, vertical_offset=1, start_page=0, end_page=None):
+        if end_page is None:
+            end_page = self.pages - 1
+        for cmd in (
+            SET_HWSCROLL_OFF,
+            SET_VSCROLL_AREA, 0, self.height, # no fixed rows
+            SET_HWSCROLL_VL if left else SET_HWSCROLL_VR,
+            0x00, start_page, _scroll_intervals[frames], end_page,
+            vertical_offset,
+            SET_HWSCROLL_ON):
+            self.write_cmd(cmd)
+
+    def hw_scroll_stop(self):
+        self.write_cmd(SET_HWSCROLL_OFF)
+        # vertical scrolling leaves the start line moved
+        self.start_line(0)
+
 
 class SSD1306_I2C(SSD1306):
     def __init__(self, width, height, i2c, addr=0x3c, external_vcc=False):
@@ -120,6 +196,7 @@ class SSD1306_I2C(SSD1306):
         # buffer).
         self.buffer = bytearray(((height // 8) * width) + 1)
         self.buffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
+        self.data_cmd = b"\x40"
         self.framebuf = framebuf.FrameBuffer1(memoryview(self.buffer)[1:], width, height)
         super().__init__(width, height, external_vcc)
 
@@ -133,6 +210,10 @@ class SSD1306_I2C(SSD1306):
         # hardware I2C interfaces.
         self.i2c.writeto(self.addr, self.buffer)
 
+    def write_data(self, start, length):
+        # Co=0, D/C=1 goes in front of the range within the same transaction
+        self.i2c.writevto(self.addr, (self.data_cmd, memoryview(self.buffer)[1 + start:1 + start + length]))
+
     def poweron(self):
         pass
 
@@ -144,29 +225,38 @@ class SSD1306_SPI(SSD1306):
         res.init(res.OUT, value=0)
         cs.init(cs.OUT, value=1)
         self.spi = spi
+        # the bus is dedicated to the display, configure it only once
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.dc = dc
         self.res = res
         self.cs = cs
+        self.cmd_buffer = bytearray(1)
         self.buffer = bytearray((height // 8) * width)
         self.framebuf = framebuf.FrameBuffer1(self.buffer, width, height)
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
-        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cmd_buffer[0] = cmd
         self.cs.high()
         self.dc.low()
         self.cs.low()
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(self.cmd_buffer)
         self.cs.high()
 
     def write_framebuf(self):
-        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs.high()
         self.dc.high()
         self.cs.low()
         self.spi.write(self.buffer)
         self.cs.high()
 
+    def write_data(self, start, length):
+        self.cs.high()
+        self.dc.high()
+        self.cs.low()
+        self.spi.write(memoryview(self.buffer)[start:start + length])
+        self.cs.high()
+
     def poweron(self):
         self.res.high()
         time.sleep_ms(1)
@@ -2,54 +2,89 @@
 # Copyright (c) 2020 Teemu Toivola
 # https://github.com/vergoh/micropython-spotify-status-display
 
-import re
+def _finish_line(line, width, center):
+    # drop dashes left dangling at either end of a line by the wrapping
+    if line.startswith("- "):
+        line = line[2:]
+    if line.endswith(" -"):
+        line = line[:-2]
+    if center and len(line) < width:
+        padding = width - len(line)
+        line = "{}{}{}".format(" " * (padding // 2), line, " " * (padding - padding // 2))
+    return line
 
-def wrap(inputstring, width = 70, center = False):
+def wrap(inputstring, width = 70, center = False, max_lines = 0):
     if inputstring is None:
         return [""]
 
-    output = []
-    chunks = inputstring.split(" ")
-    o_buffer = ""
+    # words are joined with the single space that separated them, so every
+    # line is a slice of the input and only the slice boundaries need to be
+    # tracked while walking the words once
+    breaks = []
+    length = len(inputstring)
+    line_start = -1
+    line_end = 0
+    pos = 0
+
+    while pos <= length and (max_lines <= 0 or len(breaks) <= max_lines):
+        end = inputstring.find(" ", pos)
+        if end < 0:
+            end = length
+        word_length = end - pos
 
-    for chunk in chunks:
-        if len(o_buffer) == 0:
-            if len(chunk) <= width:
-                o_buffer = chunk
+        if line_start < 0:
+            if word_length <= width:
+                if word_length > 0:
+                    line_start = pos
+                    line_end = end
+                pos = end + 1
                 continue
         else:
-            if len(o_buffer) + len(chunk) + 1 <= width:
-                o_buffer = "{} {}".format(o_buffer, chunk)
+            if line_end - line_start + word_length + 1 <= width:
+                line_end = end
+                pos = end + 1
                 continue
 
-        if len(chunk) <= width:
-            output.append(o_buffer)
-            o_buffer = chunk
-            continue
+            if word_length <= width:
+                breaks.append((line_start, line_end))
+                line_start = pos if word_length > 0 else -1
+                line_end = end
+                pos = end + 1
+                continue
 
-        # force split anything longer than "width"
-        while len(chunk):
-            if len(o_buffer) == 0:
-                space = width
+            # fill the rest of the current line with the beginning of a word
+            # that doesn't fit on any line
+            space = width - (line_end - line_start) - 1
+            if space > 0:
+                breaks.append((line_start, pos + space))
+                pos += space
             else:
-                space = width - len(o_buffer) - 1
+                breaks.append((line_start, line_end))
+            line_start = -1
 
-            small_chunk = chunk[:space]
-            chunk = chunk[space:]
+        # force split anything longer than "width"
+        while pos < end:
+            breaks.append((pos, min(pos + width, end)))
+            pos += width
+        pos = end + 1
 
-            if len(o_buffer) == 0:
-                output.append(small_chunk)
-            else:
-                o_buffer = "{} {}".format(o_buffer, small_chunk)
-                output.append(o_buffer)
-                o_buffer = ""
+    if line_start >= 0:
+        breaks.append((line_start, line_end))
+
+    truncated = False
+    if max_lines > 0 and len(breaks) > max_lines:
+        breaks = breaks[:max_lines]
+        truncated = True
+
+    output = []
+    for start, end in breaks:
+        output.append(inputstring[start:end])
 
-    if len(o_buffer):
-        output.append(o_buffer)
+    if truncated:
+        last = output[-1][:width - 3] if width > 3 else ""
+        output[-1] = "{}...".format(last.rstrip())[:width]
 
     for i in range(len(output)):
-        output[i] = re.sub(r'^- | -$', '', output[i])
-        if center:
-            output[i] = "{:^{width}}".format(output[i], width=width)
+        output[i] = _finish_line(output[i], width, center)
 
     return output
@@ -4,10 +4,11 @@ import usocket
 
 class Response:
 
-    def __init__(self, f):
+    def __init__(self, f, gzip=False):
         self.raw = f
         self.encoding = "utf-8"
         self._cached = None
+        self._gzip = gzip
         self.status_code = 0
         self.reason = ""
         self.headers = {}
@@ -22,7 +23,10 @@ class Response:
     def content(self):
         if self._cached is None:
             try:
-                self._cached = self.raw.read()
+                if self._gzip:
+                    self._cached = _gunzip_stream(self.raw).read()
+                else:
+                    self._cached = self.raw.read()
             finally:
                 self.raw.close()
                 self.raw = None
@@ -37,7 +41,19 @@ class Response:
         return ujson.loads(self.content)
 
 
-def request(method, url, data=None, json=None, headers={}, parse_headers=True):
+def _gunzip_stream(f):
+    # decompresses while reading so that the compressed content is never
+    # buffered, the decompressor needs a 32 kB window for gzip content
+    try:
+        import deflate
+        return deflate.DeflateIO(f, deflate.GZIP)
+    except ImportError:
+        # MicroPython before 1.21
+        import zlib
+        return zlib.DecompIO(f, 31)
+
+
+def request(method, url, data=None, json=None, headers={}, parse_headers=True, gzip=False):
     redir_cnt = 1
     while True:
         try:
@@ -60,6 +76,7 @@ def request(method, url, data=None, json=None, headers={}, parse_headers=True):
         ai = usocket.getaddrinfo(host, port, 0, usocket.SOCK_STREAM)
         ai = ai[0]
 
+        resp_gzip = False
         resp_d = None
         if parse_headers is not False:
             resp_d = {}
@@ -70,25 +87,28 @@ def request(method, url, data=None, json=None, headers={}, parse_headers=True):
             if proto == "https:":
                 #ctx = ussl.SSLContext()
                 s = ussl.wrap_socket(s, server_hostname=host)
-            s.write(b"%s /%s HTTP/1.0\r\n" % (method, path))
+            # Build the request head in one buffer so that it goes out as a
+            # single write instead of one TLS record per header fragment
+            req_head = bytearray(b"%s /%s HTTP/1.0\r\n" % (method, path))
             if not "Host" in headers:
-                s.write(b"Host: %s\r\n" % host)
+                req_head += b"Host: %s\r\n" % host
+            if gzip:
+                req_head += b"Accept-Encoding: gzip\r\n"
             # Iterate over keys to avoid tuple alloc
             for k in headers:
-                s.write(k)
-                s.write(b": ")
-                s.write(headers[k])
-                s.write(b"\r\n")
+                req_head += b"%s: %s\r\n" % (k, headers[k])
             if json is not None:
                 assert data is None
                 import ujson
                 data = ujson.dumps(json)
-                s.write(b"Content-Type: application/json\r\n")
+                req_head += b"Content-Type: application/json\r\n"
             if data:
-                s.write(b"Content-Length: %d\r\n" % len(data))
+                req_head += b"Content-Length: %d\r\n" % len(data)
             else:
-                s.write(b"Content-Length: 0\r\n")
-            s.write(b"Connection: close\r\n\r\n")
+                req_head += b"Content-Length: 0\r\n"
+            req_head += b"Connection: close\r\n\r\n"
+            s.write(req_head)
+            del req_head
             if data:
                 s.write(data)
 
@@ -108,6 +128,8 @@ def request(method, url, data=None, json=None, headers={}, parse_headers=True):
                 if l.startswith(b"Transfer-Encoding:"):
                     if b"chunked" in l:
                         raise ValueError("Unsupported " + l.decode())
+                elif gzip and l[:17].lower() == b"content-encoding:":
+                    resp_gzip = b"gzip" in l
                 elif (l.startswith(b"Location:") or l.startswith(b"location:")) and 300 <= status <= 399:
                     if not redir_cnt:
                         raise ValueError("Too many redirects")
@@ -132,7 +154,7 @@ def request(method, url, data=None, json=None, headers={}, parse_headers=True):
         if status != 300:
             break
 
-    resp = Response(s)
+    resp = Response(s, gzip=resp_gzip)
     resp.status_code = status
     resp.reason = reason
     if resp_d is not None:
@@ -0,0 +1,92 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# State kept in RTC memory over machine.reset() so that a restarted device can
+# skip the token refresh and show the last known track right away. RTC memory
+# doesn't survive power loss and isn't cleared on power on, so the content is
+# only used when the magic, version, length and checksum all match.
+
+import time
+import ujson
+import ustruct
+from binascii import crc32
+from micropython import const
+
+# imports from additional files
+import log
+import playback
+
+_magic = const(b"SPST")
+_version = const(1)
+_header_format = const("<4sBHI")
+_header_size = const(11)
+_rtc_memory_size = const(2048)
+
+_state = {'probed': False, 'rtc': None}
+
+def _rtc():
+    # probed only once, saving happens after every player poll
+    if not _state['probed']:
+        _state['probed'] = True
+        try:
+            from machine import RTC
+            rtc = RTC()
+            rtc.memory()
+            _state['rtc'] = rtc
+        except (ImportError, AttributeError):
+            pass
+    return _state['rtc']
+
+def save(api_tokens, device_id, state):
+    rtc = _rtc()
+    if rtc is None:
+        return
+
+    content = { 'saved': time.time(), 'device_id': device_id, 'playback': None }
+    if api_tokens is not None and 'access_token' in api_tokens and 'expires_in' in api_tokens:
+        content['access_token'] = api_tokens['access_token']
+        content['expires_in'] = api_tokens['expires_in']
+        content['timestamp'] = api_tokens['timestamp']
+    if state is not None:
+        content['playback'] = state.pack()
+
+    payload = ujson.dumps(content).encode()
+    if _header_size + len(payload) > _rtc_memory_size:
+        log.warning("warm state of {} bytes doesn't fit in rtc memory", len(payload))
+        return
+
+    rtc.memory(ustruct.pack(_header_format, _magic, _version, len(payload), crc32(payload)) + payload)
+
+def load():
+    rtc = _rtc()
+    if rtc is None:
+        return None
+
+    blob = rtc.memory()
+    if len(blob) < _header_size:
+        return None
+
+    magic, version, length, checksum = ustruct.unpack(_header_format, blob[:_header_size])
+    payload = blob[_header_size:_header_size + length]
+    if magic != _magic or version != _version or len(payload) != length or crc32(payload) != checksum:
+        log.debug("no valid warm state in rtc memory")
+        return None
+
+    try:
+        content = ujson.loads(payload)
+    except ValueError:
+        return None
+
+    # the rtc keeps running over a reset, a clock that went backwards means it didn't
+    elapsed = time.time() - content['saved']
+    if elapsed < 0:
+        return None
+
+    warm = { 'api_tokens': None, 'device_id': content['device_id'], 'playback': None }
+    if 'access_token' in content:
+        warm['api_tokens'] = { 'access_token': content['access_token'], 'expires_in': content['expires_in'], 'timestamp': content['timestamp'] }
+    if content['playback'] is not None:
+        warm['playback'] = playback.unpack(content['playback'], elapsed * 1000)
+
+    return warm
@@ -0,0 +1,88 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Compares the ways of loading the config at boot with MicroPython through
+# tools/bench_config_client.py and reports, as JSON, the median load time,
+# the heap allocated while loading and the time of one config lookup in the
+# playback loop for each of them:
+#  - json_dict: config.json parsed and validated, used as a dict
+#  - json_object: config.json parsed and validated into configutils.Config
+#  - compiled_dict: the config = {...} module compile_config wrote before
+#  - compiled_module: the module compile_config writes now
+#
+# The modules are compiled with mpy-cross the same way as for the device.
+# The credentials of src/config.json are replaced with placeholders so that
+# it passes validation.
+#
+# The garbage collector is disabled during the measurement so that the
+# allocated amount includes what parsing leaves behind. With --collect the
+# heap kept by the loaded config after a collection is reported instead,
+# which needs a build where gc.collect() is reliable: the WASI build of the
+# micropython-wasm package frees live frames when collecting.
+#
+#   python3 tools/bench_config.py --micropython ~/micropython/ports/unix/build-standard/micropython
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_tools_dir = os.path.dirname(os.path.abspath(__file__))
+_src_dir = os.path.join(_tools_dir, "..", "src")
+_variants = ("json_dict", "json_object", "compiled_dict", "compiled_module")
+
+def _prepare(directory, mpy_cross):
+    with open(os.path.join(_src_dir, "config.json"), 'r') as f:
+        config = json.load(f)
+    config['spotify'] = {'client_id': "0123456789abcdef0123456789abcdef", 'client_secret': "0123456789abcdef0123456789abcdef"}
+    config['wlan']['ssid'] = "benchmark"
+    config['wlan']['password'] = "benchmark"
+    with open(os.path.join(directory, "config.json"), 'w') as f:
+        json.dump(config, f, indent = "\t")
+
+    subprocess.run([sys.executable, os.path.join(_tools_dir, "compile_config.py"), os.path.join(directory, "config.json"),
+                    os.path.join(directory, "config.py")], check = True)
+    with open(os.path.join(directory, "config_dict.py"), 'w') as f:
+        f.write("config = {!r}\n".format(config))
+
+    sources = (os.path.join(_src_dir, "configutils.py"), os.path.join(directory, "config.py"), os.path.join(directory, "config_dict.py"))
+    for source in sources:
+        module = os.path.splitext(os.path.basename(source))[0]
+        subprocess.run([mpy_cross, source, "-o", os.path.join(directory, module + ".mpy")], check = True)
+    os.remove(os.path.join(directory, "config.py"))
+    os.remove(os.path.join(directory, "config_dict.py"))
+
+def main():
+    parser = argparse.ArgumentParser(description = "config loading benchmark")
+    parser.add_argument("--micropython", default = "micropython", help = "path to the MicroPython unix port binary")
+    parser.add_argument("--mpy-cross", default = "mpy-cross")
+    parser.add_argument("--runs", type = int, default = 5, help = "processes per variant")
+    parser.add_argument("--lookups", type = int, default = 10000, help = "loop iterations of three lookups")
+    parser.add_argument("--collect", action = "store_true", help = "report the heap kept after a collection")
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    result = {'client': args.micropython, 'variants': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        _prepare(directory, args.mpy_cross)
+        result['config_json_bytes'] = os.path.getsize(os.path.join(directory, "config.json"))
+
+        for variant in _variants:
+            runs = []
+            for _ in range(args.runs):
+                command = [args.micropython, os.path.join(_tools_dir, "bench_config_client.py"), directory, variant, str(args.lookups)]
+                if args.collect:
+                    command.append("collect")
+                client = subprocess.run(command, check = True, capture_output = True, text = True)
+                runs.append(json.loads(client.stdout.strip().splitlines()[-1]))
+            result['variants'][variant] = {key: sorted(run[key] for run in runs)[len(runs) // 2] for key in runs[0]}
+
+    json.dump(result, sys.stdout, indent = args.indent)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Client side of tools/bench_config.py, run with the MicroPython unix port
+# in a fresh process for each variant so that nothing is cached between them:
+#   micropython tools/bench_config_client.py workdir variant lookups [collect]
+# Prints one JSON object with the load time, the heap allocated while
+# loading, or with "collect" the heap kept by the loaded config after a
+# collection, and the time of the config lookups done in the playback loop.
+
+import gc
+import sys
+import time
+import ujson
+
+def _load_json_dict(workdir):
+    # config.json before it was turned into an object
+    import configutils
+    with open(workdir + "/config.json", 'r') as f:
+        config = ujson.load(f)
+    if configutils.validate(config) is not None:
+        raise RuntimeError("invalid config.json")
+    return config
+
+def _load_json_object(workdir):
+    import configutils
+    with open(workdir + "/config.json", 'r') as f:
+        config = configutils.with_defaults(ujson.load(f))
+    if configutils.validate(config) is not None:
+        raise RuntimeError("invalid config.json")
+    return configutils.Config(config)
+
+def _load_compiled_dict(workdir): # pylint: disable=unused-argument
+    # module written by tools/compile_config.py before it generated attributes
+    from config_dict import config
+    return config
+
+def _load_compiled_module(workdir): # pylint: disable=unused-argument
+    import config
+    return config
+
+def _lookup_dict(config, count):
+    total = 0
+    for _ in range(count):
+        total += config['status_poll_interval_seconds'] + config['api_request_dot_size']
+        if config['show_progress_ticks']:
+            total += 1
+    return total
+
+def _lookup_attribute(config, count):
+    total = 0
+    for _ in range(count):
+        total += config.status_poll_interval_seconds + config.api_request_dot_size
+        if config.show_progress_ticks:
+            total += 1
+    return total
+
+_variants = {
+    'json_dict': (_load_json_dict, _lookup_dict),
+    'json_object': (_load_json_object, _lookup_attribute),
+    'compiled_dict': (_load_compiled_dict, _lookup_dict),
+    'compiled_module': (_load_compiled_module, _lookup_attribute),
+}
+
+def main():
+    workdir = sys.argv[1]
+    load, lookup = _variants[sys.argv[2]]
+    count = int(sys.argv[3])
+    collect = len(sys.argv) > 4 and sys.argv[4] == "collect"
+    sys.path.insert(0, workdir)
+
+    if collect:
+        gc.collect()
+    else:
+        gc.disable()
+    alloc_before = gc.mem_alloc()
+    start = time.ticks_us()
+    config = load(workdir)
+    load_us = time.ticks_diff(time.ticks_us(), start)
+    if collect:
+        gc.collect()
+    heap_bytes = gc.mem_alloc() - alloc_before
+
+    start = time.ticks_us()
+    lookup(config, count)
+    lookup_us = time.ticks_diff(time.ticks_us(), start)
+
+    print(ujson.dumps({'load_us': load_us, 'resident_bytes' if collect else 'allocated_bytes': heap_bytes, 'lookup_ns': lookup_us * 1000 // (count * 3)}))
+
+main()
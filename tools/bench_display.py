@@ -0,0 +1,186 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Renders a corpus of artist and title pairs through OLED.show() against the
+# counting soft_i2c, i2c or spi bus from tools/stubs and reports time,
+# allocations and bytes sent per frame as JSON. For each pair the first
+# frame of a new track and a minute of per-second progress frames are
+# measured separately. The standby scenario counts what ten minutes of
+# standby send with standby_hw_scroll on and off.
+#
+# Time is host time through the framebuf stand-in, use it for comparing
+# runs with each other rather than as a device estimate. The bus time of a
+# frame and the frames/s the bus allows are calculated from the bytes and
+# transactions sent at the clock OLED configures for the bus: 9 bit times
+# per byte and 11 per transaction for start, address and stop on I2C, 8 bit
+# times per byte on SPI. SoftI2C is bit-banged and usually stays below its
+# nominal clock.
+#
+#   python3 tools/bench_display.py --bus i2c > before.json
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import hostenv
+
+_corpus = (
+    ("Daft Punk", "One More Time"),
+    ("Sigur Rós", "Starálfur"),
+    ("Motörhead", "Ace of Spades"),
+    ("Beyoncé", "Déjà Vu"),
+    ("Kino", "Группа крови"),
+    ("坂本龍一", "戦場のメリークリスマス"),
+    ("BTS", "봄날 (Spring Day)"),
+    ("Ólafur Arnalds", "Þú ert jörðin"),
+    ("Godspeed You! Black Emperor", "Sleep / Monheim / Broken Windows, Locks of Love Pt. III"),
+    ("Wolfgang Amadeus Mozart, Berliner Philharmoniker, Herbert von Karajan", "Serenade No. 13 in G Major, K. 525 \"Eine kleine Nachtmusik\": I. Allegro"),
+    ("The Lazy Podcast", "Episode 214 - Everything you never wanted to know about supercalifragilisticexpialidocious words"),
+    ("A", "B"),
+)
+
+# bus clock in Hz as configured by OLED, or the default of SoftI2C
+_bus_hz = {'soft_i2c': 400000, 'i2c': 400000, 'spi': 10 * 1024 * 1024}
+
+def _new_display(bus, standby_hw_scroll = True):
+    import oled
+    display = oled.OLED(bus = bus, dc_pin = 16, res_pin = 17, cs_pin = 5, standby_hw_scroll = standby_hw_scroll)
+    _bus(display).reset_counters()
+    return display
+
+def _bus(display):
+    return display.spi if hasattr(display, 'spi') else display.i2c
+
+def _bus_us(bus, bus_hz, bytes_sent, transactions):
+    if bus == "spi":
+        bits = bytes_sent * 8
+    else:
+        bits = bytes_sent * 9 + transactions * 11
+    return bits * 1000000 // bus_hz
+
+def _measure(func, trace):
+    if trace:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - before
+    start = time.perf_counter_ns()
+    func()
+    return (time.perf_counter_ns() - start) // 1000
+
+def _run_case(bus_name, artist, title, frames, duration_ms, trace):
+    display = _new_display(bus_name)
+    bus = _bus(display)
+    results = []
+
+    for frame in range(frames + 1):
+        progress = frame * 1000 / duration_ms * 100
+        bus.reset_counters()
+        value = _measure(lambda progress = progress: display.show(artist, title, progress = progress), trace)
+        results.append((value, bus.bytes_sent, bus.transactions))
+
+    return results
+
+def _case_result(bus, bus_hz, artist, title, timed, traced):
+    progress_timed = timed[1:]
+    progress_traced = traced[1:]
+    progress_sent = [r for r in progress_timed if r[1] > 0]
+    return {
+        'artist': artist,
+        'title': title,
+        'first_frame': {
+            'us': timed[0][0],
+            'alloc_peak_bytes': traced[0][0],
+            'bytes_sent': timed[0][1],
+            'transactions': timed[0][2],
+            'bus_us': _bus_us(bus, bus_hz, timed[0][1], timed[0][2]),
+        },
+        'progress_frames': {
+            'frames': len(progress_timed),
+            'frames_sent': len(progress_sent),
+            'us_mean': sum(r[0] for r in progress_timed) // len(progress_timed),
+            'us_max': max(r[0] for r in progress_timed),
+            'alloc_peak_bytes_max': max(r[0] for r in progress_traced),
+            'bytes_sent_mean': sum(r[1] for r in progress_timed) // len(progress_timed),
+            'bytes_per_sent_frame': sum(r[1] for r in progress_sent) // len(progress_sent) if progress_sent else 0,
+            'bus_us_per_sent_frame': _bus_us(bus, bus_hz, sum(r[1] for r in progress_sent), sum(r[2] for r in progress_sent)) // len(progress_sent) if progress_sent else 0,
+        },
+    }
+
+def _run_standby(bus_name, bus_hz, standby_hw_scroll, minutes):
+    # OLED.standby() gets called every 10 seconds during standby, see Spotify._standby()
+    display = _new_display(bus_name, standby_hw_scroll = standby_hw_scroll)
+    bus = _bus(display)
+    display.show("Spotify", "not playing", progress = 0, ticks = False)
+    bus.reset_counters()
+    for _ in range(minutes * 6):
+        display.standby()
+    return {
+        'bytes_sent': bus.bytes_sent,
+        'transactions': bus.transactions,
+        'bus_us': _bus_us(bus_name, bus_hz, bus.bytes_sent, bus.transactions),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description = "OLED.show() benchmark against a counting display bus")
+    parser.add_argument("--bus", choices = sorted(_bus_hz), default = "soft_i2c", help = "display_bus of config.json")
+    parser.add_argument("--bus-hz", type = int, help = "bus clock for the bus time, defaults to the one OLED configures")
+    parser.add_argument("--frames", type = int, default = 60, help = "progress frames rendered after the first frame of each track")
+    parser.add_argument("--duration", type = int, default = 180000, help = "track duration in ms used for the progress bar")
+    parser.add_argument("--standby-minutes", type = int, default = 10, help = "length of the standby scenario")
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    hostenv.setup()
+    bus_hz = args.bus_hz or _bus_hz[args.bus]
+
+    cases = []
+    for artist, title in _corpus:
+        timed = _run_case(args.bus, artist, title, args.frames, args.duration, False)
+        tracemalloc.start()
+        traced = _run_case(args.bus, artist, title, args.frames, args.duration, True)
+        tracemalloc.stop()
+        cases.append(_case_result(args.bus, bus_hz, artist, title, timed, traced))
+
+    first_frame_bytes = sum(c['first_frame']['bytes_sent'] for c in cases) // len(cases)
+    first_frame_bus_us = sum(c['first_frame']['bus_us'] for c in cases) // len(cases)
+    sent = [c['progress_frames'] for c in cases if c['progress_frames']['frames_sent'] > 0]
+    progress_frame_bytes = sum(p['bytes_per_sent_frame'] for p in sent) // len(sent) if sent else 0
+    progress_frame_bus_us = sum(p['bus_us_per_sent_frame'] for p in sent) // len(sent) if sent else 0
+
+    result = {
+        'implementation': "{} {}".format(sys.implementation.name, platform.python_version()),
+        'bus': args.bus,
+        'bus_hz': bus_hz,
+        'frames_per_case': args.frames + 1,
+        'cases': cases,
+        'standby': {
+            'minutes': args.standby_minutes,
+            'hw_scroll': _run_standby(args.bus, bus_hz, True, args.standby_minutes),
+            'software': _run_standby(args.bus, bus_hz, False, args.standby_minutes),
+        },
+        'summary': {
+            'first_frame_us_mean': sum(c['first_frame']['us'] for c in cases) // len(cases),
+            'first_frame_alloc_peak_bytes_max': max(c['first_frame']['alloc_peak_bytes'] for c in cases),
+            'progress_frame_us_mean': sum(c['progress_frames']['us_mean'] for c in cases) // len(cases),
+            'progress_frame_alloc_peak_bytes_max': max(c['progress_frames']['alloc_peak_bytes_max'] for c in cases),
+            'progress_frame_bytes_sent_mean': sum(c['progress_frames']['bytes_sent_mean'] for c in cases) // len(cases),
+            'first_frame_bytes': first_frame_bytes,
+            'first_frame_bus_us': first_frame_bus_us,
+            'first_frame_bus_frames_per_s': round(1000000 / first_frame_bus_us, 1) if first_frame_bus_us else 0,
+            'progress_frame_bytes': progress_frame_bytes,
+            'progress_frame_bus_us': progress_frame_bus_us,
+            'progress_frame_bus_frames_per_s': round(1000000 / progress_frame_bus_us, 1) if progress_frame_bus_us else 0,
+        },
+    }
+
+    json.dump(result, sys.stdout, indent = args.indent, ensure_ascii = False)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
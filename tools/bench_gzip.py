@@ -0,0 +1,63 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Runs the gzip decoding path of uurequests and spotify_api end to end with
+# MicroPython through tools/bench_gzip_client.py and reports, as JSON, for
+# the player reply of tools/player_reply.json both as it is and gzip
+# compressed the same way as by the api:
+#  - whether the gzip reply decodes to the same reply as the plain one
+#  - which of deflate.DeflateIO and zlib.DecompIO the port decompressed with
+#  - the median request time and heap allocated per request
+#
+# The replies are served by tools/fakesocket.py, so the network and TLS
+# are not part of the measurement. The garbage collector is disabled during
+# the requests so that the allocated amount includes the decompression
+# window. With --collect it runs between the requests instead, which needs
+# a build where gc.collect() is reliable: the WASI build of the
+# micropython-wasm package frees live frames when collecting.
+#
+#   python3 tools/bench_gzip.py --micropython ~/micropython/ports/unix/build-standard/micropython
+
+import argparse
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_tools_dir = os.path.dirname(os.path.abspath(__file__))
+
+def main():
+    parser = argparse.ArgumentParser(description = "gzip reply decoding check and benchmark")
+    parser.add_argument("--micropython", default = "micropython", help = "path to the MicroPython unix port binary")
+    parser.add_argument("--runs", type = int, default = 9, help = "requests per variant")
+    parser.add_argument("--collect", action = "store_true", help = "collect between the requests")
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    with open(os.path.join(_tools_dir, "player_reply.json"), 'r') as f:
+        body = json.dumps(json.load(f)).encode()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "reply.json"), 'wb') as f:
+            f.write(body)
+        with open(os.path.join(directory, "reply.json.gz"), 'wb') as f:
+            f.write(gzip.compress(body))
+        command = [args.micropython, os.path.join(_tools_dir, "bench_gzip_client.py"), directory, str(args.runs)]
+        if args.collect:
+            command.append("collect")
+        client = subprocess.run(command, check = True, capture_output = True, text = True)
+
+    # the client log goes to the same output, the results are on the last line
+    result = {'client': args.micropython, 'runs': args.runs}
+    result.update(json.loads(client.stdout.strip().splitlines()[-1]))
+    json.dump(result, sys.stdout, indent = args.indent)
+    print()
+
+    failed = [name for name, variant in result['variants'].items() if variant['matching_replies'] != args.runs]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
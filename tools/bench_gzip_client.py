@@ -0,0 +1,90 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Client side of tools/bench_gzip.py, run with the MicroPython unix port:
+#   micropython tools/bench_gzip_client.py directory runs [collect]
+# Serves reply.json from directory as it is and reply.json.gz with
+# "Content-Encoding: gzip" through tools/fakesocket.py to
+# spotify_api._spotify_api_request() with use_gzip off and on, checks that
+# both decode to the same reply and prints one JSON object with the
+# ticks_diff() of each request in microseconds and the heap it allocated.
+
+import gc
+import sys
+import time
+import ujson
+
+_tools_dir = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+sys.path.insert(0, _tools_dir + "/../src")
+sys.path.insert(0, _tools_dir)
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _decompressor():
+    try:
+        import deflate # pylint: disable=unused-import
+        return "deflate.DeflateIO"
+    except ImportError:
+        pass
+    try:
+        import zlib # pylint: disable=unused-import
+        return "zlib.DecompIO"
+    except ImportError:
+        return None
+
+def main():
+    directory = sys.argv[1]
+    runs = int(sys.argv[2])
+    collect = len(sys.argv) > 3 and sys.argv[3] == "collect"
+    if not collect:
+        gc.disable()
+
+    import standins
+    standins.install()
+    import fakesocket
+    fakesocket.install()
+    import spotify_api
+
+    plain = _read(directory + "/reply.json")
+    compressed = _read(directory + "/reply.json.gz")
+    content_type = "Content-Type: application/json; charset=utf-8"
+    replies = {
+        'plain': fakesocket.http_response(200, plain, (content_type,)),
+        'gzip': fakesocket.http_response(200, compressed, (content_type, "Content-Encoding: gzip")),
+    }
+    expected = ujson.loads(plain)
+    url = "https://api.spotify.com/v1/me/player?additional_types=track,episode"
+
+    result = {'decompressor': _decompressor(), 'variants': {}}
+    for name in ("plain", "gzip"):
+        spotify_api.set_gzip(name == "gzip")
+        fakesocket.answer_all(replies[name])
+        times = []
+        allocations = []
+        matches = 0
+        received = fakesocket.sent_bytes()
+        for _ in range(runs):
+            if collect:
+                gc.collect()
+            allocated = gc.mem_alloc()
+            start = time.ticks_us()
+            reply = spotify_api._spotify_api_request("GET", url, headers = {}, retry = False) # pylint: disable=protected-access
+            times.append(time.ticks_diff(time.ticks_us(), start))
+            allocations.append(gc.mem_alloc() - allocated)
+            if reply['status_code'] == 200 and reply['json'] == expected:
+                matches += 1
+            del reply
+        result['variants'][name] = {
+            'reply_bytes': len(replies[name]),
+            'request_head_bytes': (fakesocket.sent_bytes() - received) // runs,
+            'matching_replies': matches,
+            'us': sorted(times)[runs // 2],
+            'allocated_bytes': sorted(allocations)[runs // 2],
+        }
+
+    print(ujson.dumps(result))
+
+main()
@@ -0,0 +1,128 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Serves a Spotify sized player reply from a local HTTPS server with a
+# self-signed certificate, as plain content with content-length, chunked,
+# gzip encoded and behind a redirect, and drives uurequests.request() and
+# spotify_api._spotify_api_request() against it with the MicroPython unix
+# port through tools/bench_http_client.py. Reports requests/s, p50/p95
+# latency and peak allocation per scenario as JSON.
+#
+#   python3 tools/bench_http.py --micropython ~/micropython/ports/unix/build-standard/micropython
+#
+# Needs openssl for creating the certificate.
+
+import argparse
+import gzip
+import http.server
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+
+_tools_dir = os.path.dirname(os.path.abspath(__file__))
+
+def _player_reply():
+    # same structure and about the same size as a /v1/me/player reply for a track
+    with open(os.path.join(_tools_dir, "player_reply.json"), 'r') as f:
+        return json.dumps(json.load(f)).encode()
+
+_body = _player_reply()
+_body_gzip = gzip.compress(_body)
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+    def _send(self, body, encoding = None, chunked = False):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if chunked:
+            for i in range(0, len(body), 1024):
+                chunk = body[i:i + 1024]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.wfile.write(body)
+
+    def do_GET(self): # pylint: disable=invalid-name
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        path = self.path.split("?", 1)[0]
+
+        if path == "/content-length":
+            self._send(_body)
+        elif path == "/chunked":
+            self._send(_body, chunked = True)
+        elif path in ("/gzip", "/v1/me/player"):
+            if accepts_gzip:
+                self._send(_body_gzip, encoding = "gzip")
+            else:
+                self._send(_body)
+        elif path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "https://127.0.0.1:{}/content-length".format(self.server.server_address[1]))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_error(404)
+
+def _create_certificate(directory):
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-subj", "/CN=127.0.0.1", "-days", "1",
+                    "-keyout", key, "-out", cert], check = True, capture_output = True)
+    return cert, key
+
+def main():
+    parser = argparse.ArgumentParser(description = "uurequests benchmark against a local HTTPS server")
+    parser.add_argument("--micropython", default = "micropython", help = "path to the MicroPython unix port binary")
+    parser.add_argument("--requests", type = int, default = 50, help = "requests per scenario")
+    parser.add_argument("--port", type = int, default = 8443)
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = _create_certificate(directory)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", args.port), _Handler)
+        server.socket = context.wrap_socket(server.socket, server_side = True)
+        thread = threading.Thread(target = server.serve_forever, daemon = True)
+        thread.start()
+
+        try:
+            client = subprocess.run([args.micropython, os.path.join(_tools_dir, "bench_http_client.py"), os.path.join(_tools_dir, "..", "src"),
+                                     "https://127.0.0.1:{}".format(server.server_address[1]), str(args.requests)],
+                                    check = True, capture_output = True, text = True)
+        finally:
+            server.shutdown()
+
+    # the client log goes to the same output, the results are on the last line
+    scenarios = json.loads(client.stdout.strip().splitlines()[-1])
+
+    result = {
+        'client': args.micropython,
+        'body_bytes': len(_body),
+        'body_gzip_bytes': len(_body_gzip),
+        'scenarios': scenarios,
+    }
+    json.dump(result, sys.stdout, indent = args.indent)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
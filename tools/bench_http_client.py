@@ -0,0 +1,92 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Client side of tools/bench_http.py, run with the MicroPython unix port so
+# that uurequests uses the same usocket, ussl and ujson as on the device:
+#   micropython tools/bench_http_client.py src https://127.0.0.1:8443 50
+# Prints one JSON object with the results of each scenario.
+
+import gc
+import sys
+import time
+import ujson
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * percent // 100)]
+
+def _uurequests_get(path, gzip = False):
+    import uurequests
+
+    def get(base_url):
+        r = uurequests.request("GET", base_url + path, gzip = gzip)
+        content = r.content
+        r.close()
+        return r.status_code == 200 and len(content) > 0
+    return get
+
+def _spotify_api_get(gzip = False):
+    import spotify_api
+
+    def get(base_url):
+        spotify_api.set_gzip(gzip)
+        r = spotify_api._spotify_api_request("GET", base_url + "/v1/me/player", headers = {'Authorization': "Bearer benchmark"}, retry = False) # pylint: disable=protected-access
+        return r['status_code'] == 200 and 'is_playing' in r['json']
+    return get
+
+def _run(scenario, base_url, count):
+    latencies = []
+    errors = 0
+    peak = 0
+    started = time.ticks_ms()
+
+    for _ in range(count):
+        gc.collect()
+        # without collections the allocated amount only grows, the growth
+        # during a request is the most heap it can have needed
+        gc.disable()
+        allocated = gc.mem_alloc()
+        request_start = time.ticks_us()
+        try:
+            ok = scenario(base_url)
+        except (OSError, ValueError):
+            ok = False
+        latencies.append(time.ticks_diff(time.ticks_us(), request_start))
+        peak = max(peak, gc.mem_alloc() - allocated)
+        gc.enable()
+        if not ok:
+            errors += 1
+
+    elapsed_ms = time.ticks_diff(time.ticks_ms(), started)
+
+    return {
+        'requests': count,
+        'errors': errors,
+        'requests_per_s': count * 1000 / elapsed_ms if elapsed_ms > 0 else 0,
+        'p50_ms': _percentile(latencies, 50) / 1000,
+        'p95_ms': _percentile(latencies, 95) / 1000,
+        'peak_alloc_bytes': peak,
+    }
+
+def main():
+    sys.path.insert(0, sys.argv[1])
+    base_url = sys.argv[2]
+    count = int(sys.argv[3])
+
+    scenarios = (
+        ("content-length", _uurequests_get("/content-length")),
+        ("chunked", _uurequests_get("/chunked")),
+        ("gzip", _uurequests_get("/gzip", gzip = True)),
+        ("redirect", _uurequests_get("/redirect")),
+        ("spotify_api", _spotify_api_get()),
+        ("spotify_api_gzip", _spotify_api_get(gzip = True)),
+    )
+
+    results = {}
+    for name, scenario in scenarios:
+        results[name] = _run(scenario, base_url, count)
+
+    print(ujson.dumps(results))
+
+main()
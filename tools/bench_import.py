@@ -0,0 +1,101 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Imports the modules of src with MicroPython through
+# tools/bench_import_client.py in the three layouts of Configuration.md and
+# reports, as JSON, the median import time and heap use of each module and
+# gc.mem_free() after each import:
+#  - py: the sources as they are, compiled on the device at import
+#  - mpy: compiled with mpy-cross
+#  - frozen: frozen into the firmware with the manifest of "make manifest",
+#    needs a binary built with it given with --frozen-micropython
+#
+# The garbage collector is disabled during the imports so that the heap use
+# includes what compiling leaves behind. With --collect the heap kept by
+# each module after a collection is reported instead, which needs a build
+# where gc.collect() is reliable: the WASI build of the micropython-wasm
+# package frees live frames when collecting.
+#
+# machine, network, uasyncio, usocket and ussl are replaced with empty
+# stand-ins where the port lacks them, as they are built in on the device.
+#
+#   python3 tools/bench_import.py --micropython ~/micropython/ports/unix/build-standard/micropython \
+#       --frozen-micropython ~/micropython/ports/unix/build-frozen/micropython
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+_tools_dir = os.path.dirname(os.path.abspath(__file__))
+_src_dir = os.path.join(_tools_dir, "..", "src")
+
+def _prepare(directory, mpy_cross):
+    py_dir = os.path.join(directory, "py")
+    mpy_dir = os.path.join(directory, "mpy")
+    os.mkdir(py_dir)
+    os.mkdir(mpy_dir)
+    for name in sorted(os.listdir(_src_dir)):
+        if not name.endswith(".py") or name == "main.py":
+            continue
+        shutil.copy(os.path.join(_src_dir, name), py_dir)
+        subprocess.run([mpy_cross, os.path.join(_src_dir, name), "-o", os.path.join(mpy_dir, name[:-3] + ".mpy")], check = True)
+    return py_dir, mpy_dir
+
+def _median(values):
+    return sorted(values)[len(values) // 2]
+
+def _run(micropython, moduledir, runs, collect):
+    results = []
+    for _ in range(runs):
+        command = [micropython, os.path.join(_tools_dir, "bench_import_client.py"), moduledir]
+        if collect:
+            command.append("collect")
+        client = subprocess.run(command, check = True, capture_output = True, text = True)
+        results.append(json.loads(client.stdout.strip().splitlines()[-1]))
+
+    modules = []
+    for i, module in enumerate(results[0]['modules']):
+        modules.append({
+            'module': module['module'],
+            'us': _median([r['modules'][i]['us'] for r in results]),
+            'bytes': _median([r['modules'][i]['bytes'] for r in results]),
+            'mem_free': _median([r['modules'][i]['mem_free'] for r in results]),
+        })
+    return {
+        'stood_in': results[0]['stood_in'],
+        'mem_free_start': _median([r['mem_free_start'] for r in results]),
+        'total_us': sum(m['us'] for m in modules),
+        'total_bytes': sum(m['bytes'] for m in modules),
+        'modules': modules,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description = "module import benchmark for the .py, .mpy and frozen layouts")
+    parser.add_argument("--micropython", default = "micropython", help = "path to the MicroPython unix port binary")
+    parser.add_argument("--frozen-micropython", help = "unix port binary built with the manifest of \"make manifest\"")
+    parser.add_argument("--mpy-cross", default = "mpy-cross")
+    parser.add_argument("--runs", type = int, default = 5, help = "processes per layout")
+    parser.add_argument("--collect", action = "store_true", help = "report the heap kept after a collection")
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    result = {'client': args.micropython, 'layouts': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        py_dir, mpy_dir = _prepare(directory, args.mpy_cross)
+        result['layouts']['py'] = _run(args.micropython, py_dir, args.runs, args.collect)
+        result['layouts']['mpy'] = _run(args.micropython, mpy_dir, args.runs, args.collect)
+        if args.frozen_micropython:
+            result['frozen_client'] = args.frozen_micropython
+            result['layouts']['frozen'] = _run(args.frozen_micropython, "", args.runs, args.collect)
+
+    json.dump(result, sys.stdout, indent = args.indent)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
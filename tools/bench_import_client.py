@@ -0,0 +1,63 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Client side of tools/bench_import.py, run with the MicroPython unix port:
+#   micropython tools/bench_import_client.py moduledir [collect]
+# Imports the modules of src from moduledir, or from the frozen modules of
+# the binary when moduledir is empty, dependencies first, and prints one
+# JSON object with gc.mem_free() after each import and the ticks_diff() of
+# each import in microseconds.
+
+import gc
+import sys
+import time
+import ujson
+
+# dependencies first so that each import measures only the module itself
+_modules = ("helpers", "log", "textutils", "configutils", "metrics", "ssd1306", "oled", "buzzer", "buttonpress_async",
+            "playback", "warmstate", "uurequests", "spotify_api", "spotify_auth", "spotify")
+
+# provided by the firmware of the device with the names used from them,
+# stood in for where the port lacks them
+_platform_modules = (("machine", ("Pin", "SoftI2C", "I2C", "SPI", "PWM")), ("network", ("WLAN",)), ("uasyncio", ()), ("usocket", ()), ("ussl", ()))
+
+class _StandIn:
+    def __getattr__(self, name):
+        return None
+
+def main():
+    moduledir = sys.argv[1]
+    collect = len(sys.argv) > 2 and sys.argv[2] == "collect"
+    if moduledir:
+        sys.path.insert(0, moduledir)
+
+    stood_in = []
+    for name, names in _platform_modules:
+        try:
+            module = __import__(name)
+            if all(hasattr(module, n) for n in names):
+                continue
+        except ImportError:
+            pass
+        sys.modules[name] = _StandIn()
+        stood_in.append(name)
+
+    if collect:
+        gc.collect()
+    else:
+        gc.disable()
+
+    result = {'stood_in': stood_in, 'mem_free_start': gc.mem_free(), 'modules': []}
+    for name in _modules:
+        before = gc.mem_free()
+        start = time.ticks_us()
+        __import__(name)
+        import_us = time.ticks_diff(time.ticks_us(), start)
+        if collect:
+            gc.collect()
+        result['modules'].append({'module': name, 'us': import_us, 'mem_free': gc.mem_free(), 'bytes': before - gc.mem_free()})
+
+    print(ujson.dumps(result))
+
+main()
@@ -0,0 +1,100 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Wraps long artist and title strings the way OLED does, with textutils.wrap()
+# and with the implementation it replaced from tools/check_wrap.py, and
+# reports time and peak allocation per call as JSON.
+#
+# Time is host time, use it for comparing the two implementations and runs
+# with each other rather than as a device estimate.
+#
+#   python3 tools/bench_wrap.py
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import hostenv
+import check_wrap
+
+_width = 16
+
+_corpus = (
+    "Wolfgang Amadeus Mozart, Berliner Philharmoniker, Herbert von Karajan",
+    "Serenade No. 13 in G Major, K. 525 \"Eine kleine Nachtmusik\": I. Allegro",
+    "Symphony No. 9 in D Minor, Op. 125 \"Choral\": IV. Presto - Allegro assai - Presto (O Freunde, nicht diese Töne)",
+    "Goldberg Variations, BWV 988: Aria da capo - 1981 Digital Recording",
+    "Episode 214 - Everything you never wanted to know about supercalifragilisticexpialidocious words",
+    "Sleep / Monheim / Broken Windows, Locks of Love Pt. III",
+    "Godspeed You! Black Emperor",
+)
+
+def _reference(text):
+    return check_wrap._reference_wrap(text, width = _width, center = True)[0] # pylint: disable=protected-access
+
+def _current(text, max_lines):
+    import textutils
+    return textutils.wrap(text, width = _width, center = True, max_lines = max_lines)
+
+def _time_us(func, rounds):
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter_ns() - start) / rounds / 1000
+
+def _alloc_peak(func):
+    func()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return peak
+
+def _measure(func, rounds):
+    return {
+        'us': round(_time_us(func, rounds), 2),
+        'alloc_peak_bytes': _alloc_peak(func),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description = "textutils.wrap() benchmark with long titles")
+    parser.add_argument("--rounds", type = int, default = 2000, help = "calls per measurement")
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    hostenv.setup()
+
+    cases = []
+    for text in _corpus:
+        cases.append({
+            'text': text,
+            'lines': len(_current(text, 0)),
+            'previous': _measure(lambda text = text: _reference(text), args.rounds),
+            'current': _measure(lambda text = text: _current(text, 0), args.rounds),
+            'current_max_lines_3': _measure(lambda text = text: _current(text, 3), args.rounds),
+        })
+
+    result = {
+        'implementation': "{} {}".format(sys.implementation.name, platform.python_version()),
+        'width': _width,
+        'cases': cases,
+        'summary': {},
+    }
+    for variant in ('previous', 'current', 'current_max_lines_3'):
+        result['summary'][variant] = {
+            'us_mean': round(sum(c[variant]['us'] for c in cases) / len(cases), 2),
+            'alloc_peak_bytes_max': max(c[variant]['alloc_peak_bytes'] for c in cases),
+        }
+
+    json.dump(result, sys.stdout, indent = args.indent, ensure_ascii = False)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Checks the heap allocation budgets of the playback loop with MicroPython
+# and exits non-zero when one is exceeded:
+#  - render: the per-second progress update of an already laid out track,
+#    PlaybackState.progress_now_ms() and OLED.show(), must not allocate
+#  - poll: a player request from the raw HTTP reply through uurequests and
+#    the ujson decoding in spotify_api._spotify_api_request() to handling
+#    the reply in _get_currently_playing() and saving the warm restart
+#    state must stay within a fixed amount
+#
+# Allocations are gc.mem_alloc() deltas with the collector disabled. The
+# track is 5:54 long and the clock is the real ticks_ms(). The player reply
+# in tools/player_reply.json is served by tools/fakesocket.py. framebuf is
+# the real one, the rest of the firmware modules are the stand-ins of
+# tools/standins.py.
+#
+#   micropython tools/check_alloc.py
+
+import gc
+import sys
+import ujson
+
+_tools_dir = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+sys.path.insert(0, _tools_dir + "/../src")
+sys.path.insert(0, _tools_dir)
+
+_render_budget_bytes = 0
+# about 18 kB of it is ujson.loads() of the 4.7 kB reply, mostly the two
+# available_markets lists, and 6 kB the request and reading the content
+_poll_budget_bytes = 32768
+_warmup_calls = 2
+_runs = 5
+_duration_ms = 354320
+_progress_step_ms = 2800
+
+def _allocated(func):
+    before = gc.mem_alloc()
+    func()
+    return gc.mem_alloc() - before
+
+def _check(name, func, budget):
+    for _ in range(_warmup_calls):
+        func()
+    worst = max(_allocated(func) for _ in range(_runs)) - _allocated(lambda: None)
+    ok = worst <= budget
+    print("{}: {} {} bytes, budget {} bytes".format("ok" if ok else "FAIL", name, worst, budget))
+    return ok
+
+def main():
+    # nothing gets collected, the poll budget and the imports fit in the default heap
+    gc.disable()
+    import standins
+    standins.install()
+    import fakesocket
+    fakesocket.install()
+
+    import configutils
+    import oled
+    import playback
+    import spotify
+    import warmstate
+
+    with open(_tools_dir + "/player_reply.json", 'r') as f:
+        reply = ujson.load(f)
+    reply['item']['duration_ms'] = _duration_ms
+    body = ujson.dumps(reply).encode()
+    fakesocket.answer_all(fakesocket.http_response(200, body, ("Content-Type: application/json; charset=utf-8",)))
+    del reply
+
+    display = oled.OLED()
+    state = playback.PlaybackState(ujson.loads(body))
+
+    def render():
+        display.show(state.artist, state.title, progress = state.progress_now_ms(), ticks = True, progress_max = state.duration_ms)
+
+    def render_next():
+        # moves the progress bar by a pixel so that also the drawing and transfer of a changed frame gets measured
+        state.progress_ms = (state.progress_ms + _progress_step_ms) % _duration_ms
+        render()
+
+    api_tokens = {'access_token': "a" * 300, 'expires_in': 3600, 'timestamp': 1700000000, 'refresh_token': "r" * 130}
+    class _Player(spotify.Spotify):
+        def __init__(self): # pylint: disable=super-init-not-called
+            # without the hardware and network setup
+            pass
+
+    player = _Player()
+    player.oled = display
+    player.config = configutils.Config({'api_request_dot_size': 2})
+    player.device_id = None
+    player.pause_check_track_id = None
+
+    def poll():
+        polled = player._get_currently_playing(api_tokens) # pylint: disable=protected-access
+        warmstate.save(api_tokens, player.device_id, polled)
+
+    frames = standins.Bus.frames
+    results = [_check("unchanged progress frame", render, _render_budget_bytes)]
+    unchanged_frames = standins.Bus.frames - frames
+    results.append(_check("changed progress frame", render_next, _render_budget_bytes))
+    changed_frames = standins.Bus.frames - frames - unchanged_frames
+    results += [
+        _check("player poll of {} bytes".format(len(body)), poll, _poll_budget_bytes),
+    ]
+    gc.enable()
+
+    # the first call lays out the track, after that only the changed frames are sent
+    if unchanged_frames != 1 or changed_frames != _warmup_calls + _runs:
+        print("FAIL: {} unchanged and {} changed frames sent, expected 1 and {}".format(unchanged_frames, changed_frames, _warmup_calls + _runs))
+        return 1
+
+    if fakesocket.connections() != _warmup_calls + _runs:
+        print("FAIL: {} player requests made, expected {}".format(fakesocket.connections(), _warmup_calls + _runs))
+        return 1
+
+    return 0 if all(results) else 1
+
+sys.exit(main())
@@ -0,0 +1,145 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Compares textutils.wrap() with the implementation it replaced and checks
+# the properties of max_lines, exits non-zero on the first failure:
+#  - known cases, including the ones where the old implementation produced
+#    an over-wide line or a trailing space, with explicit expectations
+#  - random inputs give the same output as the old implementation, except
+#    for inputs hitting those quirks, and no line exceeds the width
+#  - with max_lines, no line exceeds the width, there are never more than
+#    max_lines lines and text that fits is left untouched
+#
+#   python3 tools/check_wrap.py [iterations]
+
+import random
+import re
+import sys
+
+import hostenv
+
+# (inputstring, width, center, max_lines, expected)
+_cases = (
+    (None, 16, False, 0, [""]),
+    ("", 16, False, 0, []),
+    ("One More Time", 16, False, 0, ["One More Time"]),
+    ("One More Time", 16, True, 0, [" One More Time  "]),
+    ("One More Time", 8, False, 0, ["One More", "Time"]),
+    ("Supercalifragilisticexpialidocious", 16, False, 0, ["Supercalifragili", "sticexpialidocio", "us"]),
+    ("Sleep - Monheim", 7, False, 0, ["Sleep", "Monheim"]),
+    ("a  b", 2, False, 0, ["a ", "b"]),
+    # the start of an over-long word fills the rest of the line
+    ("ab cdefghij", 5, False, 0, ["ab cd", "efghi", "j"]),
+    # quirk: a line at width - 1 followed by an over-long word was closed with a trailing space,
+    # old output ["abcd ", "efghi", "jklmn"]
+    ("abcd efghijklmn", 5, False, 0, ["abcd", "efghi", "jklmn"]),
+    # quirk: a full line followed by an over-long word became wider than width,
+    # old output ["abcde fghijklmno", "p"]
+    ("abcde fghijklmnop", 5, False, 0, ["abcde", "fghij", "klmno", "p"]),
+    ("Serenade No. 13 in G Major, K. 525", 16, False, 2, ["Serenade No. 13", "in G Major, K..."]),
+    ("Serenade No. 13 in G Major, K. 525", 16, False, 3, ["Serenade No. 13", "in G Major, K.", "525"]),
+    ("Supercalifragilisticexpialidocious", 16, True, 1, ["Supercalifrag..."]),
+    ("abcdef", 2, False, 1, [".."]),
+)
+
+def _reference_wrap(inputstring, width = 70, center = False):
+    # textutils.wrap() before max_lines was added, returns the output and
+    # whether one of the known quirks was hit
+    if inputstring is None:
+        return [""], False
+
+    output = []
+    chunks = inputstring.split(" ")
+    o_buffer = ""
+    quirk = False
+
+    for chunk in chunks:
+        if len(o_buffer) == 0:
+            if len(chunk) <= width:
+                o_buffer = chunk
+                continue
+        else:
+            if len(o_buffer) + len(chunk) + 1 <= width:
+                o_buffer = "{} {}".format(o_buffer, chunk)
+                continue
+
+        if len(chunk) <= width:
+            output.append(o_buffer)
+            o_buffer = chunk
+            continue
+
+        # force split anything longer than "width"
+        while len(chunk):
+            if len(o_buffer) == 0:
+                space = width
+            else:
+                space = width - len(o_buffer) - 1
+                if space <= 0:
+                    quirk = True
+
+            small_chunk = chunk[:space]
+            chunk = chunk[space:]
+
+            if len(o_buffer) == 0:
+                output.append(small_chunk)
+            else:
+                o_buffer = "{} {}".format(o_buffer, small_chunk)
+                output.append(o_buffer)
+                o_buffer = ""
+
+    if len(o_buffer):
+        output.append(o_buffer)
+
+    for i in range(len(output)):
+        output[i] = re.sub(r'^- | -$', '', output[i])
+        if center:
+            output[i] = "{:^{width}}".format(output[i], width=width)
+
+    return output, quirk
+
+def _random_input(rnd):
+    parts = ("a", "b", "-", " ", "  ", "abcdefgh", "- ", "é", "xyzxyzxyzxyzxyzxyzxyz")
+    return "".join(rnd.choice(parts) for _ in range(rnd.randint(0, 14)))
+
+def main():
+    hostenv.setup()
+    import textutils
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    for inputstring, width, center, max_lines, expected in _cases:
+        result = textutils.wrap(inputstring, width = width, center = center, max_lines = max_lines)
+        if result != expected:
+            print("FAIL: wrap({!r}, width = {}, center = {}, max_lines = {}) returned {!r}, expected {!r}".format(inputstring, width, center, max_lines, result, expected))
+            return 1
+
+    rnd = random.Random(2)
+    quirks = 0
+    for _ in range(iterations):
+        inputstring = _random_input(rnd)
+        width = rnd.randint(1, 20)
+        center = rnd.random() < 0.5
+
+        result = textutils.wrap(inputstring, width = width, center = center)
+        reference, quirk = _reference_wrap(inputstring, width = width, center = center)
+        if any(len(line) > width for line in result):
+            print("FAIL: wrap({!r}, width = {}, center = {}) returned {!r}".format(inputstring, width, center, result))
+            return 1
+        if quirk:
+            quirks += 1
+        elif result != reference:
+            print("FAIL: wrap({!r}, width = {}, center = {}) returned {!r}, previous implementation {!r}".format(inputstring, width, center, result, reference))
+            return 1
+
+        for max_lines in (1, 2, 3):
+            limited = textutils.wrap(inputstring, width = width, center = center, max_lines = max_lines)
+            if len(limited) > max_lines or any(len(line) > width for line in limited) or (len(result) <= max_lines and limited != result):
+                print("FAIL: wrap({!r}, width = {}, center = {}, max_lines = {}) returned {!r}".format(inputstring, width, center, max_lines, limited))
+                return 1
+
+    print("ok: {} cases, {} random inputs of which {} hit the quirks of the previous implementation".format(len(_cases), iterations, quirks))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
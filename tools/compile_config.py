@@ -0,0 +1,49 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Validates config.json on the host and writes it out as a Python module
+# that can be compiled with mpy-cross and imported on the device instead
+# of parsing and validating config.json during every boot.
+#
+# Integer and boolean entries are written as const() values and the rest
+# as plain values, so the module has the same attributes as the Config
+# object built from config.json. source_size is the size of config.json,
+# for noticing on the device when a config.json next to the compiled
+# module is no longer the one it was built from.
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import configutils
+
+def main():
+    if len(sys.argv) != 3:
+        print("usage: {} config.json config.py".format(sys.argv[0]))
+        return 1
+
+    with open(sys.argv[1], 'r') as f:
+        config = configutils.with_defaults(json.load(f))
+
+    error = configutils.validate(config)
+    if error is not None:
+        print("{}: {}".format(sys.argv[1], error))
+        return 1
+
+    with open(sys.argv[2], 'w') as f:
+        f.write("# generated from config.json by tools/compile_config.py, do not edit\n")
+        f.write("from micropython import const\n\n")
+        f.write("source_size = const({})\n".format(os.path.getsize(sys.argv[1])))
+        for key, value in config.items():
+            if type(value) in (bool, int):
+                f.write("{} = const({!r})\n".format(key, value))
+            else:
+                f.write("{} = {!r}\n".format(key, value))
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
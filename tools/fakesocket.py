@@ -0,0 +1,84 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# usocket and ussl stand-ins for MicroPython that answer each connection
+# with a raw HTTP response given beforehand, so that uurequests and
+# spotify_api run their whole read and decode path without a network.
+# install() needs to be called before uurequests is imported.
+#
+# The socket is an io.IOBase stream so that deflate.DeflateIO can read the
+# content the same way as from a real socket.
+
+import io
+import sys
+
+SOCK_STREAM = 1
+
+_state = {'responses': [], 'repeat': None, 'connections': 0, 'sent_bytes': 0}
+
+def install():
+    sys.modules['usocket'] = sys.modules[__name__]
+    sys.modules['ussl'] = sys.modules[__name__]
+
+def queue(response):
+    # answers the next connection, an int fails it with that errno instead
+    _state['responses'].append(response)
+
+def answer_all(response):
+    # answers every connection for which nothing is queued
+    _state['repeat'] = response
+
+def pending():
+    return len(_state['responses'])
+
+def connections():
+    return _state['connections']
+
+def sent_bytes():
+    return _state['sent_bytes']
+
+def http_response(status, body = b"", headers = ()):
+    head = "HTTP/1.0 {} Status\r\nContent-Length: {}\r\n".format(status, len(body))
+    for header in headers:
+        head += header + "\r\n"
+    return head.encode() + b"\r\n" + body
+
+def getaddrinfo(host, port, af = 0, socktype = 0): # pylint: disable=unused-argument
+    return [(2, SOCK_STREAM, 0, "", (host, port))]
+
+def wrap_socket(sock, server_hostname = None): # pylint: disable=unused-argument
+    return sock
+
+class socket(io.IOBase): # pylint: disable=invalid-name
+    def __init__(self, af = 2, socktype = SOCK_STREAM, proto = 0): # pylint: disable=unused-argument
+        super().__init__()
+        self._reply = None
+
+    def connect(self, address): # pylint: disable=unused-argument
+        if _state['responses']:
+            response = _state['responses'].pop(0)
+        else:
+            response = _state['repeat']
+        if response is None:
+            raise OSError(113)
+        _state['connections'] += 1
+        if isinstance(response, int):
+            raise OSError(response)
+        self._reply = io.BytesIO(response)
+
+    def write(self, data):
+        _state['sent_bytes'] += len(data)
+        return len(data)
+
+    def readinto(self, buf):
+        return self._reply.readinto(buf)
+
+    def read(self, size = -1):
+        return self._reply.read(size)
+
+    def readline(self):
+        return self._reply.readline()
+
+    def close(self):
+        pass
@@ -0,0 +1,88 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Opens parallel connections against the login server the same way browsers
+# do with favicon and prefetch requests, including clients that connect and
+# never send anything, and then completes the login with a callback request.
+#
+# Either target a device waiting for login:
+#   python3 tools/hammer_auth.py 192.168.1.10
+# or run spotify_auth on the host (needs permission to listen on port 80):
+#   python3 tools/hammer_auth.py --local
+
+import argparse
+import asyncio
+import collections
+import sys
+
+import hostenv
+
+async def _client(host, port, path, timeout, idle = False):
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError) as e:
+        return "connect failed: {}".format(e.__class__.__name__)
+
+    try:
+        if idle:
+            # hold the connection without sending a request
+            await reader.read()
+            return "idle closed by server"
+        writer.write("GET {} HTTP/1.1\r\nHost: {}\r\n\r\n".format(path, host).encode())
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(), timeout)
+        if not reply:
+            return "empty reply"
+        return reply.split(b"\r\n")[0].decode()
+    except (OSError, asyncio.TimeoutError) as e:
+        return "failed: {}".format(e.__class__.__name__)
+    finally:
+        writer.close()
+
+async def _hammer(args):
+    server = None
+    if args.local:
+        hostenv.setup()
+        import spotify_auth
+        server = asyncio.ensure_future(spotify_auth.get_authorization_code("client_id", "http://localhost/callback/", "127.0.0.1", "localhost"))
+        await asyncio.sleep(0.2)
+
+    paths = ["/", "/favicon.ico", "/nonexistent"]
+    clients = [_client(args.host, args.port, paths[i % len(paths)], args.timeout) for i in range(args.clients)]
+    clients += [_client(args.host, args.port, None, args.timeout, idle = True) for i in range(args.idle)]
+
+    results = collections.Counter(await asyncio.gather(*clients))
+    for result, count in sorted(results.items()):
+        print("{:5} {}".format(count, result))
+
+    failures = sum(count for result, count in results.items() if not result.startswith("HTTP/1.0") and result != "idle closed by server")
+
+    callback = await _client(args.host, args.port, "/callback/?code=hammer&state=1", args.timeout)
+    print("callback: {}".format(callback))
+
+    if server is not None:
+        code = await asyncio.wait_for(server, args.timeout)
+        print("authorization code: {}".format(code))
+        if code != "hammer":
+            failures += 1
+
+    if not callback.startswith("HTTP/1.0 200"):
+        failures += 1
+
+    return 1 if failures else 0
+
+def main():
+    parser = argparse.ArgumentParser(description = "parallel connection test for the login server")
+    parser.add_argument("host", nargs = "?", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 80)
+    parser.add_argument("--clients", type = int, default = 40, help = "parallel clients sending a request")
+    parser.add_argument("--idle", type = int, default = 5, help = "parallel clients connecting without sending anything")
+    parser.add_argument("--timeout", type = float, default = 30, help = "seconds, needs to exceed the server side client timeout")
+    parser.add_argument("--local", action = "store_true", help = "run spotify_auth on the host instead of targeting a device")
+    args = parser.parse_args()
+
+    return asyncio.run(_hammer(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
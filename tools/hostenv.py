@@ -0,0 +1,37 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Makes the modules in src importable on the host by putting the stand-ins
+# for MicroPython specific modules from tools/stubs first in the module path
+# and adding the MicroPython specific functions of the time and gc modules.
+
+import builtins
+import gc
+import os
+import sys
+import time
+
+_tools_dir = os.path.dirname(os.path.abspath(__file__))
+
+def setup():
+    for path in (os.path.join(_tools_dir, "..", "src"), os.path.join(_tools_dir, "stubs")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    if not hasattr(time, 'ticks_ms'):
+        time.ticks_ms = lambda: int(time.monotonic() * 1000)
+        time.ticks_us = lambda: int(time.monotonic() * 1000000)
+        time.ticks_diff = lambda new, old: new - old
+        time.ticks_add = lambda ticks, delta: ticks + delta
+        time.sleep_ms = lambda milliseconds: time.sleep(milliseconds / 1000)
+
+    # a fixed size heap, the host has no use for the numbers beyond them being valid
+    if not hasattr(gc, 'mem_free'):
+        gc.mem_free = lambda: 100000
+        gc.mem_alloc = lambda: 20000
+        gc.threshold = lambda amount = None: -1
+
+    # ssd1306 uses const() without importing it, as allowed by MicroPython
+    if not hasattr(builtins, 'const'):
+        builtins.const = lambda value: value
@@ -0,0 +1,169 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Replays an api trace recorded on the device with "api_trace_kb" in
+# config.json through uurequests and spotify_api with MicroPython, and
+# reports as JSON the request handling time per endpoint and, for player
+# replies, the time of PlaybackState() and of rendering the track with
+# OLED.show(). The recorded replies are served by tools/fakesocket.py and
+# the rest of the firmware modules are the stand-ins of tools/standins.py.
+#
+# Requests are made at the recorded timing divided by speed, or back to
+# back with a speed of 0. A request that spotify_api retries consumes the
+# next recorded reply the same way as on the device, including the 500 ms
+# wait before the retry. The garbage collector needs to be disabled with
+# nocollect on the WASI build of the micropython-wasm package, which frees
+# live frames when collecting, and the heap sized for the whole trace.
+#
+#   mpremote cp :api_trace.jsonl .
+#   micropython tools/replay.py api_trace.jsonl [speed] [nocollect]
+
+import gc
+import sys
+import time
+import ujson
+
+_tools_dir = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+sys.path.insert(0, _tools_dir + "/../src")
+sys.path.insert(0, _tools_dir)
+
+# decided by uurequests from the reply as it is read, not recorded as such
+_skipped_headers = ("content-length", "content-encoding", "transfer-encoding")
+
+def _errno(error):
+    # "[Errno 113] EHOSTUNREACH" or "-202", the trace has the str() of the OSError
+    digits = ""
+    for c in error or "":
+        if "0" <= c <= "9":
+            digits += c
+        elif digits:
+            break
+    return int(digits) if digits else 113
+
+def _response(entry):
+    import fakesocket
+    if entry['status'] == 0:
+        return _errno(entry.get('error'))
+    headers = []
+    for key in entry.get('headers', {}):
+        if key.lower() not in _skipped_headers:
+            headers.append("{}: {}".format(key, entry['headers'][key]))
+    return fakesocket.http_response(entry['status'], entry.get('body', "").encode(), headers)
+
+def _load(path):
+    # only the request and the raw reply of each entry are kept in memory
+    requests = []
+    with open(path, 'r') as f:
+        for line in f:
+            entry = ujson.loads(line)
+            if 'boot' in entry:
+                requests.append(None)
+            else:
+                requests.append((entry['t'], entry['method'], entry['url'], _response(entry)))
+    return requests
+
+def _endpoint(url):
+    return url.split("?", 1)[0].split("/", 3)[3]
+
+def _add(stats, key, value):
+    stat = stats.get(key)
+    if stat is None:
+        stats[key] = [1, value, value]
+    else:
+        stat[0] += 1
+        stat[1] += value
+        if value > stat[2]:
+            stat[2] = value
+
+def _summary(stats):
+    return {key: {'count': s[0], 'us_mean': s[1] // s[0], 'us_max': s[2]} for key, s in stats.items()}
+
+def _wait(t, speed, session_start):
+    if speed <= 0:
+        return
+    wait_ms = int(t / speed) - time.ticks_diff(time.ticks_ms(), session_start)
+    if wait_ms > 0:
+        time.sleep_ms(wait_ms)
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: micropython tools/replay.py api_trace.jsonl [speed] [nocollect]")
+        return 2
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    if "nocollect" in sys.argv:
+        gc.disable()
+
+    import standins
+    standins.install()
+    import fakesocket
+    fakesocket.install()
+
+    import oled
+    import playback
+    import spotify_api
+
+    requests = _load(sys.argv[1])
+    for request in requests:
+        if request is not None:
+            fakesocket.queue(request[3])
+
+    display = oled.OLED()
+    requests_stats = {}
+    status_counts = {}
+    parse_stats = {}
+    replay_start = time.ticks_ms()
+    session_start = replay_start
+    sessions = 0
+    made = 0
+    i = 0
+    while i < len(requests):
+        if requests[i] is None:
+            session_start = time.ticks_ms()
+            sessions += 1
+            i += 1
+            continue
+        t, method, url = requests[i][:3]
+        _wait(t, speed, session_start)
+
+        pending = fakesocket.pending()
+        start = time.ticks_us()
+        reply = spotify_api._spotify_api_request(method, url, headers = {}) # pylint: disable=protected-access
+        request_us = time.ticks_diff(time.ticks_us(), start)
+        consumed = pending - fakesocket.pending()
+        if consumed == 0:
+            break
+        made += 1
+        i += consumed
+        endpoint = _endpoint(url)
+        _add(requests_stats, endpoint, request_us)
+        key = "{} {}".format(endpoint, reply['status_code'])
+        status_counts[key] = status_counts.get(key, 0) + 1
+
+        if endpoint == "v1/me/player" and reply['status_code'] == 200 and 'item' in reply['json']:
+            start = time.ticks_us()
+            state = playback.PlaybackState(reply['json'])
+            _add(parse_stats, "playback_state", time.ticks_diff(time.ticks_us(), start))
+            start = time.ticks_us()
+            if state.has_progress():
+                display.show(state.artist, state.title, progress = state.progress_now_ms(), progress_max = state.duration_ms)
+            else:
+                display.show(state.artist, state.title)
+            _add(parse_stats, "render", time.ticks_diff(time.ticks_us(), start))
+
+    result = {
+        'trace': sys.argv[1],
+        'speed': speed,
+        'sessions': sessions,
+        'recorded_replies': len([r for r in requests if r is not None]),
+        'requests_made': made,
+        'replay_ms': time.ticks_diff(time.ticks_ms(), replay_start),
+        'statuses': status_counts,
+        'requests': _summary(requests_stats),
+        'player_replies': _summary(parse_stats),
+        'frames': standins.Bus.frames,
+    }
+    print(ujson.dumps(result))
+    return 0
+
+sys.exit(main())
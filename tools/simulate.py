@@ -0,0 +1,387 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Runs Spotify._looper() from src on the host against a fake Spotify API
+# under a virtual clock and reports what the device would have done as JSON:
+# API calls per endpoint and per hour, display frames and bus bytes, and the
+# time from each scripted button press to the next frame on the display.
+#
+# Nothing waits for real time. The clock moves when the firmware sleeps,
+# when asyncio has nothing to run before its next timer and by the
+# simulated latency of each API request, so an hour runs in seconds and
+# the same arguments always give the same result.
+#
+#   python3 tools/simulate.py --hours 2 --press 300:next --press 900:playpause:long
+#
+# The fake API keeps a playlist playing, moves to the next track at the end
+# of each one and stops playing after --stop-minutes to get the device into
+# standby. --error-rate and --throttle-rate make requests fail with 503 and
+# 429 replies.
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import selectors
+import sys
+import tempfile
+import time
+
+import hostenv
+
+_epoch = 1700000000
+_client_id = "0123456789abcdef0123456789abcdef"
+
+_playlist = (
+    ("4tZwfgrHOc3mvqYlEYSvVi", "Daft Punk", "0DiWol3AO6WpXZgp0goxAV", "One More Time", 320357),
+    ("0k17h0D3J5VfsdmQ1iZtE9", "Pink Floyd", "6mFkJmJqdDVQ1REhVfGgd1", "Wish You Were Here", 334743),
+    ("6olE6TJLqED3rqDCT0FyPh", "Nirvana", "4CeeEOM32jQcH3eN9Q2dGj", "Smells Like Teen Spirit", 301920),
+    ("3WrFJ7ztbogyGnTHbHJFl2", "The Beatles", "6dGnYIeXmHdcikdzNNDMm2", "Here Comes The Sun - Remastered 2009", 185733),
+    ("1dfeR4HaWDbWqFHLkxsg1d", "Queen", "4u7EnebtmKWzUH433cf5Qv", "Bohemian Rhapsody - Remastered 2011", 354320),
+)
+
+class _Clock:
+    def __init__(self):
+        self.ms = 0.0
+
+    def advance(self, ms):
+        if ms > 0:
+            self.ms += ms
+
+    def now_ms(self):
+        return int(self.ms)
+
+    def install(self):
+        time.time = lambda: _epoch + int(self.ms // 1000)
+        time.ticks_ms = lambda: int(self.ms)
+        time.ticks_us = lambda: int(self.ms * 1000)
+        time.sleep = lambda seconds: self.advance(seconds * 1000)
+        time.sleep_ms = self.advance
+
+class _VirtualSelector(selectors.BaseSelector):
+    # nothing is ever ready, waiting for I/O only moves the clock to the next timer
+    def __init__(self, clock):
+        self._clock = clock
+        self._map = {}
+
+    def register(self, fileobj, events, data = None):
+        key = selectors.SelectorKey(fileobj, fileobj if isinstance(fileobj, int) else fileobj.fileno(), events, data)
+        self._map[fileobj] = key
+        return key
+
+    def unregister(self, fileobj):
+        return self._map.pop(fileobj)
+
+    def select(self, timeout = None):
+        if timeout is None:
+            raise RuntimeError("nothing scheduled, the simulation would wait forever")
+        self._clock.advance(timeout * 1000)
+        return []
+
+    def get_map(self):
+        return self._map
+
+class _VirtualLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock):
+        self._clock = clock
+        super().__init__(_VirtualSelector(clock))
+
+    def time(self):
+        return self._clock.ms / 1000
+
+class _ScriptedPin:
+    # pulled up button pin that reads 0 during the scripted presses
+    def __init__(self, clock, on_press):
+        self._clock = clock
+        self._on_press = on_press
+        self.presses = []
+
+    def value(self, value = None): # pylint: disable=unused-argument
+        now = self._clock.ms
+        for press in self.presses:
+            if press['at_ms'] <= now < press['at_ms'] + press['duration_ms']:
+                if 'track_id' not in press:
+                    self._on_press(press)
+                return 0
+        return 1
+
+class _FakeSpotify:
+    def __init__(self, clock, rnd, args):
+        self._clock = clock
+        self._rnd = rnd
+        self._latency_ms = args.latency_ms
+        self._error_rate = args.error_rate
+        self._throttle_rate = args.throttle_rate
+        self._stop_ms = args.stop_minutes * 60000 if args.stop_minutes > 0 else None
+        self._skips_ms = sorted(seconds * 1000 for seconds in args.skip)
+        self.calls = {}
+        self.saved = []
+        self.pause_remaining_ms = []
+        self._index = 0
+        self._playing = True
+        self._progress_ms = 0
+        self._anchor_ms = 0.0
+
+    def _update(self):
+        # moves the playlist forward to the current moment
+        now = self._clock.ms
+        while self._skips_ms and now >= self._skips_ms[0]:
+            self._set_progress(self._skips_ms.pop(0))
+            self._index = (self._index + 1) % len(_playlist)
+            self._progress_ms = 0
+        if self._stop_ms is not None and self._playing and now >= self._stop_ms:
+            # cleared first as moving the progress to the stop comes back here
+            stop_ms = self._stop_ms
+            self._stop_ms = None
+            self._set_progress(stop_ms)
+            self._playing = False
+        if not self._playing:
+            self._anchor_ms = now
+            return
+        progress = self._progress_ms + now - self._anchor_ms
+        while progress >= _playlist[self._index][4]:
+            progress -= _playlist[self._index][4]
+            self._index = (self._index + 1) % len(_playlist)
+        self._progress_ms = int(progress)
+        self._anchor_ms = now
+
+    def playing_track_id(self):
+        self._update()
+        return _playlist[self._index][2] if self._playing else None
+
+    def _set_progress(self, at_ms):
+        saved_now = self._clock.ms
+        self._clock.ms = at_ms
+        self._update()
+        self._clock.ms = saved_now
+
+    def _player(self):
+        artist_id, artist, track_id, title, duration_ms = _playlist[self._index]
+        return {
+            'device': {'id': "ed01a3ca8def0a1772eab7be6c4b0bb37b06163e", 'is_active': True, 'name': "Living Room", 'type': "Speaker", 'volume_percent': 40},
+            'repeat_state': "off", 'shuffle_state': False, 'timestamp': _epoch * 1000 + int(self._clock.ms),
+            'progress_ms': self._progress_ms, 'is_playing': self._playing, 'currently_playing_type': "track",
+            'item': {'id': track_id, 'name': title, 'duration_ms': duration_ms, 'type': "track",
+                     'artists': [{'id': artist_id, 'name': artist, 'type': "artist"}]},
+        }
+
+    def _handle(self, method, path):
+        if path == "api/token":
+            return 200, {'access_token': "simulated", 'token_type': "Bearer", 'expires_in': 3600, 'scope': "user-read-playback-state"}
+        if method == "GET" and path == "v1/me/player":
+            return 200, self._player()
+        if method == "PUT" and path == "v1/me/player/pause":
+            if self._playing:
+                self.pause_remaining_ms.append(_playlist[self._index][4] - self._progress_ms)
+            self._playing = False
+            return 204, None
+        if method == "PUT" and path == "v1/me/player/play":
+            self._playing = True
+            return 204, None
+        if method == "POST" and path == "v1/me/player/next":
+            self._index = (self._index + 1) % len(_playlist)
+            self._progress_ms = 0
+            return 204, None
+        if method == "PUT" and path == "v1/me/tracks":
+            return 200, None
+        return 404, {'error': {'status': 404, 'message': "Service not found"}}
+
+    def request(self, method, url, data = None, headers = None, gzip = False): # pylint: disable=unused-argument
+        import uurequests
+
+        path = url.split("/", 3)[3]
+        query = ""
+        if "?" in path:
+            path, query = path.split("?", 1)
+        endpoint = "{} {}".format(method, path)
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+        # the request reaches the service halfway through the round trip
+        latency_ms = self._latency_ms * (0.5 + self._rnd.random())
+        self._clock.advance(latency_ms / 2)
+        self._update()
+
+        if self._rnd.random() < self._throttle_rate:
+            status, content = 429, {'error': {'status': 429, 'message': "API rate limit exceeded"}}
+        elif self._rnd.random() < self._error_rate:
+            status, content = 503, None
+        else:
+            status, content = self._handle(method, path)
+            if path == "v1/me/tracks" and status == 200:
+                self.saved.extend(query.split("=", 1)[1].split(","))
+
+        self._clock.advance(latency_ms / 2)
+
+        body = b"" if content is None else json.dumps(content).encode()
+        r = uurequests.Response(io.BytesIO(body))
+        r.status_code = status
+        return r
+
+def _parse_press(text):
+    # seconds:button[:long]
+    parts = text.split(":")
+    if len(parts) not in (2, 3) or parts[1] not in ("playpause", "next") or (len(parts) == 3 and parts[2] != "long"):
+        raise argparse.ArgumentTypeError("press needs to be seconds:playpause|next[:long]")
+    return {'at_ms': float(parts[0]) * 1000, 'button': parts[1], 'long': len(parts) == 3}
+
+def _write_config(directory, args):
+    with open(os.path.join(directory, "src", "config.json")) as f:
+        config = json.load(f)
+    config.update({
+        'use_led': False, 'setup_network': False, 'enable_webrepl': False, 'use_display': True, 'use_buzzer': False,
+        'status_poll_interval_seconds': args.poll_interval, 'log_level': "debug" if args.log else "warning", 'metrics_port': 0,
+    })
+    config['spotify'] = {'client_id': _client_id, 'client_secret': _client_id}
+    config['wlan'] = {'ssid': "simulated", 'password': "simulated", 'mdns': "spostatus"}
+    return config
+
+def _run(args):
+    clock = _Clock()
+    hostenv.setup()
+    clock.install()
+
+    import machine
+    import oled
+    import spotify
+    import spotify_api
+
+    loop = _VirtualLoop(clock)
+    asyncio.set_event_loop(loop)
+
+    frames = []
+    area_writes = []
+    bus_bytes = [0]
+    i2c_writeto = machine.SoftI2C.writeto
+    i2c_writevto = machine.SoftI2C.writevto
+
+    def writeto(bus, addr, buf):
+        i2c_writeto(bus, addr, buf)
+        bus_bytes[0] += len(buf)
+        # single commands are two bytes, anything else is frame content
+        if len(buf) > 2:
+            frames.append(clock.ms)
+
+    def writevto(bus, addr, vector):
+        i2c_writevto(bus, addr, vector)
+        bus_bytes[0] += sum(len(buf) for buf in vector)
+        area_writes.append(clock.ms)
+
+    machine.SoftI2C.writeto = writeto
+    machine.SoftI2C.writevto = writevto
+
+    screens = []
+    oled_show = oled.OLED.show
+
+    def show(display, artist, title, *show_args, **show_kwargs):
+        if not screens or screens[-1][1:] != (artist, title):
+            screens.append((clock.ms, artist, title))
+        return oled_show(display, artist, title, *show_args, **show_kwargs)
+
+    oled.OLED.show = show
+
+    fake = _FakeSpotify(clock, random.Random(args.seed), args)
+    spotify_api.requests = fake
+
+    device = spotify.Spotify()
+
+    pins = {}
+    for name in ("playpause", "next"):
+        pin = _ScriptedPin(clock, lambda press: press.update(track_id = fake.playing_track_id()))
+        getattr(device, "button_" + name).pin = pin
+        pins[name] = pin
+    presses = []
+    for press in args.press:
+        press = dict(press, duration_ms = args.long_press_ms if press['long'] else 100)
+        pins[press['button']].presses.append(press)
+        presses.append(press)
+
+    stopped = None
+    try:
+        loop.run_until_complete(asyncio.wait_for(device._looper(), args.hours * 3600)) # pylint: disable=protected-access
+    except asyncio.TimeoutError:
+        pass
+    except (RuntimeError, SystemExit) as e:
+        stopped = "{}: {}".format(e.__class__.__name__, e)
+    for task in asyncio.all_tasks(loop):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
+    loop.close()
+
+    return clock, fake, frames, area_writes, bus_bytes[0], screens, presses, stopped
+
+def main():
+    parser = argparse.ArgumentParser(description = "Spotify._looper() under a virtual clock against a fake Spotify API")
+    parser.add_argument("--hours", type = float, default = 1, help = "simulated time")
+    parser.add_argument("--poll-interval", type = int, default = 20, help = "status_poll_interval_seconds")
+    parser.add_argument("--latency-ms", type = int, default = 300, help = "mean API round trip, varies between 0.5x and 1.5x")
+    parser.add_argument("--error-rate", type = float, default = 0, help = "share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type = float, default = 0, help = "share of requests answered with 429")
+    parser.add_argument("--stop-minutes", type = float, default = 0, help = "stop playback from elsewhere after this many minutes")
+    parser.add_argument("--skip", type = float, action = "append", default = [], help = "skip to the next track from elsewhere after this many seconds, repeatable")
+    parser.add_argument("--press", type = _parse_press, action = "append", default = [], help = "button press as seconds:playpause|next[:long], repeatable")
+    parser.add_argument("--long-press-ms", type = int, default = 1000)
+    parser.add_argument("--seed", type = int, default = 1)
+    parser.add_argument("--log", action = "store_true", help = "print the firmware log at debug level to stderr")
+    parser.add_argument("--indent", type = int, default = 1)
+    args = parser.parse_args()
+
+    source_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    config = _write_config(source_dir, args)
+
+    firmware_output = io.StringIO()
+    with tempfile.TemporaryDirectory() as directory:
+        # the firmware reads and writes its files in the current directory
+        with open(os.path.join(directory, "config.json"), "w") as f:
+            json.dump(config, f)
+        with open(os.path.join(directory, "refresh_token.txt"), "w") as f:
+            f.write("simulated")
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            with contextlib.redirect_stdout(sys.stderr if args.log else firmware_output):
+                clock, fake, frames, area_writes, bus_bytes, screens, presses, stopped = _run(args)
+        finally:
+            os.chdir(cwd)
+
+    hours = clock.ms / 3600000
+    api_calls = sum(fake.calls.values())
+    button_latencies = []
+    for press in presses:
+        released_ms = press['at_ms'] + press['duration_ms']
+        next_frames = [t for t in frames if t >= released_ms]
+        next_screens = [s for s in screens if s[0] >= released_ms]
+        button_latencies.append({
+            'at_s': press['at_ms'] / 1000,
+            'button': press['button'],
+            'long': press['long'],
+            'frame_ms': int(next_frames[0] - released_ms) if next_frames else None,
+            'screen': "{} / {}".format(next_screens[0][1], next_screens[0][2]) if next_screens else None,
+            'playing_track_id': press.get('track_id'),
+        })
+
+    result = {
+        'simulated_hours': round(hours, 3),
+        'stopped': stopped,
+        'api_calls': api_calls,
+        'api_calls_per_hour': round(api_calls / hours, 1) if hours > 0 else 0,
+        'api_calls_by_endpoint': dict(sorted(fake.calls.items())),
+        'frames': len(frames),
+        'frames_per_minute': round(len(frames) / hours / 60, 2) if hours > 0 else 0,
+        'area_writes': len(area_writes),
+        'bus_bytes': bus_bytes,
+        'screens_shown': len(screens),
+        'buttons': button_latencies,
+        'saved_tracks': fake.saved,
+        'pause_remaining_ms': fake.pause_remaining_ms,
+    }
+    json.dump(result, sys.stdout, indent = args.indent)
+    print()
+    return 0 if stopped is None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
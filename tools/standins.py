@@ -0,0 +1,66 @@
+# MIT License
+# Copyright (c) 2026 Teemu Toivola
+# https://github.com/vergoh/micropython-spotify-status-display
+
+# Stand-ins for the modules of the device firmware for running the modules
+# of src with the MicroPython unix port. The display bus, pins and RTC do
+# nothing as they are implemented in C on the device, network and uasyncio
+# are stood in for only where the port lacks them. install() needs to be
+# called before the modules of src are imported.
+
+import sys
+
+class Bus:
+    # pylint: disable=unused-argument
+    frames = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def writeto(self, addr, buf):
+        # commands are two bytes, a frame is the whole display ram
+        if len(buf) > 2:
+            Bus.frames += 1
+
+    def writevto(self, addr, vector):
+        pass
+
+class Pin:
+    # pylint: disable=unused-argument
+    IN = 0
+    OUT = 1
+    PULL_UP = 2
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def value(self, value = None):
+        return 1
+
+class RTC:
+    _memory = b""
+
+    def memory(self, data = None):
+        if data is None:
+            return RTC._memory
+        RTC._memory = data
+        return None
+
+class Machine:
+    Pin = Pin
+    SoftI2C = Bus
+    I2C = Bus
+    SPI = Bus
+    PWM = Bus
+    RTC = RTC
+
+class StandIn:
+    pass
+
+def install():
+    sys.modules['machine'] = Machine
+    for name in ("network", "uasyncio"):
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = StandIn
@@ -0,0 +1,73 @@
+# host stand-in for the MicroPython framebuf module, only MONO_VLSB is
+# supported and text is drawn as a fixed pattern per character instead of
+# the real font
+
+# pylint: disable=unused-argument
+
+MONO_VLSB = 0
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, buf_format = MONO_VLSB):
+        self.buf = buf
+        self.width = width
+        self.height = height
+
+    def fill(self, col):
+        value = 0xff if col else 0
+        for i in range(len(self.buf)):
+            self.buf[i] = value
+
+    def pixel(self, x, y, col = None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        index = (y >> 3) * self.width + x
+        bit = 1 << (y & 7)
+        if col is None:
+            return 1 if self.buf[index] & bit else 0
+        if col:
+            self.buf[index] |= bit
+        else:
+            self.buf[index] &= ~bit & 0xff
+        return None
+
+    def hline(self, x, y, w, col):
+        self.fill_rect(x, y, w, 1, col)
+
+    def vline(self, x, y, h, col):
+        self.fill_rect(x, y, 1, h, col)
+
+    def fill_rect(self, x, y, w, h, col):
+        for j in range(max(y, 0), min(y + h, self.height)):
+            for i in range(max(x, 0), min(x + w, self.width)):
+                self.pixel(i, j, col)
+
+    def rect(self, x, y, w, h, col, fill = False):
+        if fill:
+            self.fill_rect(x, y, w, h, col)
+            return
+        self.hline(x, y, w, col)
+        self.hline(x, y + h - 1, w, col)
+        self.vline(x, y, h, col)
+        self.vline(x + w - 1, y, h, col)
+
+    def text(self, string, x, y, col = 1):
+        for k, c in enumerate(string):
+            if c == ' ':
+                continue
+            pattern = ord(c) * 2654435761
+            for j in range(7):
+                for i in range(7):
+                    if pattern >> ((i * 7 + j) % 29) & 1:
+                        self.pixel(x + k * 8 + i, y + j, col)
+
+    def blit(self, source, x, y, key = -1):
+        for j in range(max(y, 0), min(y + source.height, self.height)):
+            for i in range(max(x, 0), min(x + source.width, self.width)):
+                col = source.pixel(i - x, j - y)
+                if col != key:
+                    self.pixel(i, j, col)
+
+    def scroll(self, xstep, ystep):
+        pass
+
+FrameBuffer1 = FrameBuffer
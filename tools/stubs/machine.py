@@ -0,0 +1,84 @@
+# host stand-in for the MicroPython machine module, the buses count what is
+# sent through them instead of driving any hardware
+
+# pylint: disable=unused-argument
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 2
+
+    def __init__(self, pin, mode = -1, pull = -1, value = None):
+        self.pin = pin
+        self._value = value or 0
+
+    def init(self, mode = -1, pull = -1, value = None):
+        if value is not None:
+            self._value = value
+
+    def value(self, value = None):
+        if value is None:
+            return self._value
+        self._value = value
+        return None
+
+    def high(self):
+        self._value = 1
+
+    def low(self):
+        self._value = 0
+
+class _CountingBus:
+    def __init__(self, *args, **kwargs):
+        self.bytes_sent = 0
+        self.transactions = 0
+
+    def reset_counters(self):
+        self.bytes_sent = 0
+        self.transactions = 0
+
+class SoftI2C(_CountingBus):
+    def writeto(self, addr, buf):
+        self.bytes_sent += len(buf)
+        self.transactions += 1
+
+    def writevto(self, addr, vector):
+        for buf in vector:
+            self.bytes_sent += len(buf)
+        self.transactions += 1
+
+class I2C(SoftI2C):
+    pass
+
+class SPI(_CountingBus):
+    def init(self, *args, **kwargs):
+        pass
+
+    def write(self, buf):
+        self.bytes_sent += len(buf)
+        self.transactions += 1
+
+class PWM:
+    def __init__(self, pin, freq = 0, duty = 0):
+        pass
+
+    def freq(self, freq = None):
+        pass
+
+    def duty(self, duty = None):
+        pass
+
+    def deinit(self):
+        pass
+
+_rtc_memory = [b""]
+
+class RTC:
+    def memory(self, data = None):
+        if data is None:
+            return _rtc_memory[0]
+        _rtc_memory[0] = bytes(data)
+        return None
+
+def reset():
+    raise SystemExit("machine.reset()")
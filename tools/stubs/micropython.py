@@ -0,0 +1,7 @@
+# host stand-in for the MicroPython micropython module
+
+def const(value):
+    return value
+
+def mem_info():
+    pass
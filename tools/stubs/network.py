@@ -0,0 +1,28 @@
+# host stand-in for the MicroPython network module
+
+# pylint: disable=unused-argument
+
+STA_IF = 0
+AP_IF = 1
+
+class WLAN:
+    def __init__(self, interface = STA_IF):
+        self._active = False
+
+    def active(self, active = None):
+        if active is None:
+            return self._active
+        self._active = active
+        return None
+
+    def connect(self, ssid = None, password = None):
+        pass
+
+    def config(self, **kwargs):
+        pass
+
+    def isconnected(self):
+        return True
+
+    def ifconfig(self):
+        return ("127.0.0.1", "255.0.0.0", "127.0.0.1", "127.0.0.1")
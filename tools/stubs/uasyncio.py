@@ -0,0 +1,7 @@
+# host stand-in for uasyncio
+
+# pylint: disable=wildcard-import,unused-wildcard-import,redefined-builtin
+from asyncio import *
+
+def sleep_ms(milliseconds):
+    return sleep(milliseconds / 1000)
@@ -0,0 +1,4 @@
+# host stand-in for usocket
+
+# pylint: disable=wildcard-import,unused-wildcard-import
+from socket import *
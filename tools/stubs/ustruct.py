@@ -0,0 +1,4 @@
+# host stand-in for ustruct
+
+# pylint: disable=wildcard-import,unused-wildcard-import
+from struct import *